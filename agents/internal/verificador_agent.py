@@ -3,6 +3,7 @@
 
 import json
 import os
+import orjson
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from utils.logger import app_logger
@@ -302,8 +303,9 @@ class AgenteVerificador:
         filename = f"{self.analysis_dir}analysis_{timestamp}.json"
 
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(analysis, f, indent=2, ensure_ascii=False)
+            # orjson escribe UTF-8 directamente (json queda para las reglas)
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(analysis, option=orjson.OPT_INDENT_2))
             app_logger.info(f"Análisis guardado en: {filename}")
         except Exception as e:
             app_logger.error(f"Error guardando análisis: {e}")
@@ -23,6 +23,7 @@ class AppConfig:
         self.environment = os.getenv('APP_ENV', 'development')
         self.debug = os.getenv('APP_DEBUG', 'false').lower() == 'true'
         self.timezone_str = os.getenv('TIMEZONE', 'UTC')
+        self.log_level = os.getenv('LOG_LEVEL', 'DEBUG').upper()
 
         # Configuración de zona horaria
         try:
@@ -86,4 +87,12 @@ class AppConfig:
         Returns:
             String con el nombre de la aplicación
         """
-        return self.app_name
\ No newline at end of file
+        return self.app_name
+
+    def get_log_level(self):
+        """
+        Obtiene el nivel mínimo de log configurado
+        Returns:
+            String con el nivel (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        """
+        return self.log_level
@@ -0,0 +1,16 @@
+# Instancia compartida de la configuración de la aplicación
+# AppConfig solo lee variables de entorno al construirse, por lo que una única
+# instancia por proceso basta para todos los componentes
+
+import functools
+from config.app_config import AppConfig
+
+
+@functools.lru_cache(maxsize=1)
+def get_app_config() -> AppConfig:
+    """
+    Obtiene la configuración de la aplicación, creándola en el primer uso
+    Returns:
+        Instancia compartida de AppConfig
+    """
+    return AppConfig()
@@ -4,6 +4,8 @@
 
 import os
 from dotenv import load_dotenv
+from mysql.connector import HAVE_CEXT
+from mysql.connector.constants import ClientFlag
 
 # Carga las variables de entorno desde el archivo .env
 load_dotenv()
@@ -22,6 +24,7 @@ class DatabaseConfig:
         self.database = os.getenv('DB_NAME', 'test_db')
         self.username = os.getenv('DB_USER', 'root')
         self.password = os.getenv('DB_PASSWORD', '')
+        self.pool_size = int(os.getenv('DB_POOL_SIZE', 25))
 
     def get_config(self):
         """
@@ -36,9 +39,35 @@ class DatabaseConfig:
             'user': self.username,
             'password': self.password,
             'charset': 'utf8mb4',
-            'autocommit': True
+            'autocommit': True,
+            # Usar la extensión en C para el protocolo binario de sentencias preparadas
+            # cuando está instalada; sin ella use_pure=False haría fallar la conexión
+            'use_pure': not HAVE_CEXT,
+            # rowcount de UPDATE cuenta las filas encontradas, no solo las modificadas:
+            # repetir una actualización con los mismos valores sigue siendo un éxito
+            'client_flags': [ClientFlag.FOUND_ROWS]
         }
 
+    def get_pool_config(self):
+        """
+        Obtiene la configuración del pool de conexiones compartido
+        El tamaño se lee de DB_POOL_SIZE (25 por defecto), limitado al máximo
+        que admite mysql-connector
+        Returns:
+            Diccionario con los parámetros del pool y de conexión
+        """
+        pool_size = min(max(self.pool_size, 1), 32)
+
+        config = self.get_config()
+        config.update({
+            'pool_name': 'livechat',
+            'pool_size': pool_size,
+            # Conservar el estado de sesión para reutilizar sentencias preparadas
+            'pool_reset_session': False,
+            'connection_timeout': 5
+        })
+        return config
+
     def get_connection_string(self):
         """
         Genera la cadena de conexión para la base de datos
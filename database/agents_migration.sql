@@ -35,7 +35,7 @@ CREATE TABLE IF NOT EXISTS `agent_usage` (
     `id` INT AUTO_INCREMENT PRIMARY KEY,
     `agent_id` INT NOT NULL,
     `user_id` INT,
-    `session_id` VARCHAR(36),
+    `session_id` VARCHAR(36) CHARACTER SET ascii COLLATE ascii_bin,
     `interaction_id` INT,
     `tokens_used` INT DEFAULT 0,
     `prompt_tokens` INT DEFAULT 0,
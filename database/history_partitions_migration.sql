@@ -0,0 +1,69 @@
+-- Migración para particionar el historial por mes
+-- Permite eliminar historial antiguo con DROP PARTITION (operación de metadatos)
+-- en lugar de borrar fila a fila, y habilita el pruning por rango de fechas
+--
+-- Restricciones de MySQL para tablas particionadas:
+--   * No admiten claves foráneas (ni propias ni que las referencien)
+--   * La columna de partición debe formar parte de la clave primaria
+--   * Para columnas TIMESTAMP solo se permite UNIX_TIMESTAMP() como expresión
+--
+-- Las particiones de los meses siguientes y la eliminación de las expiradas
+-- las gestiona HistoryModel.maintain_partitions()
+
+USE `livechat-ia`;
+
+-- Eliminar claves foráneas incompatibles con el particionado
+-- Los nombres se consultan en information_schema: los generados por MySQL
+-- (tabla_ibfk_N) dependen del orden en que se crearon las restricciones
+
+-- Claves de agent_usage que referencian a history
+SET @drop_fks = (
+    SELECT GROUP_CONCAT(CONCAT('DROP FOREIGN KEY `', CONSTRAINT_NAME, '`') SEPARATOR ', ')
+    FROM information_schema.REFERENTIAL_CONSTRAINTS
+    WHERE CONSTRAINT_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'agent_usage'
+      AND REFERENCED_TABLE_NAME = 'history'
+);
+SET @sql = IF(@drop_fks IS NULL, 'DO 0', CONCAT('ALTER TABLE `agent_usage` ', @drop_fks));
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- Claves propias de history (users, sessions)
+SET @drop_fks = (
+    SELECT GROUP_CONCAT(CONCAT('DROP FOREIGN KEY `', CONSTRAINT_NAME, '`') SEPARATOR ', ')
+    FROM information_schema.REFERENTIAL_CONSTRAINTS
+    WHERE CONSTRAINT_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'history'
+);
+SET @sql = IF(@drop_fks IS NULL, 'DO 0', CONCAT('ALTER TABLE `history` ', @drop_fks));
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- Incluir created_at en la clave primaria
+ALTER TABLE `history`
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (`id`, `created_at`);
+
+-- Particionar por mes sobre created_at
+ALTER TABLE `history`
+PARTITION BY RANGE (UNIX_TIMESTAMP(`created_at`)) (
+    PARTITION `p_old` VALUES LESS THAN (UNIX_TIMESTAMP('2025-09-01 00:00:00')),
+    PARTITION `p202509` VALUES LESS THAN (UNIX_TIMESTAMP('2025-10-01 00:00:00')),
+    PARTITION `p202510` VALUES LESS THAN (UNIX_TIMESTAMP('2025-11-01 00:00:00')),
+    PARTITION `p202511` VALUES LESS THAN (UNIX_TIMESTAMP('2025-12-01 00:00:00')),
+    PARTITION `p202512` VALUES LESS THAN (UNIX_TIMESTAMP('2026-01-01 00:00:00')),
+    PARTITION `p202601` VALUES LESS THAN (UNIX_TIMESTAMP('2026-02-01 00:00:00')),
+    PARTITION `p202602` VALUES LESS THAN (UNIX_TIMESTAMP('2026-03-01 00:00:00')),
+    PARTITION `p202603` VALUES LESS THAN (UNIX_TIMESTAMP('2026-04-01 00:00:00')),
+    PARTITION `p202604` VALUES LESS THAN (UNIX_TIMESTAMP('2026-05-01 00:00:00')),
+    PARTITION `p202605` VALUES LESS THAN (UNIX_TIMESTAMP('2026-06-01 00:00:00')),
+    PARTITION `p202606` VALUES LESS THAN (UNIX_TIMESTAMP('2026-07-01 00:00:00')),
+    PARTITION `p202607` VALUES LESS THAN (UNIX_TIMESTAMP('2026-08-01 00:00:00')),
+    PARTITION `p202608` VALUES LESS THAN (UNIX_TIMESTAMP('2026-09-01 00:00:00')),
+    PARTITION `p202609` VALUES LESS THAN (UNIX_TIMESTAMP('2026-10-01 00:00:00')),
+    PARTITION `p202610` VALUES LESS THAN (UNIX_TIMESTAMP('2026-11-01 00:00:00')),
+    PARTITION `p202611` VALUES LESS THAN (UNIX_TIMESTAMP('2026-12-01 00:00:00')),
+    PARTITION `p_future` VALUES LESS THAN MAXVALUE
+);
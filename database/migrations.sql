@@ -20,14 +20,14 @@ CREATE TABLE IF NOT EXISTS `users` (
     `last_login` TIMESTAMP NULL,
     `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     `updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    INDEX `idx_username` (`username`),
+    INDEX `idx_username_auth` (`username`, `password_hash`, `is_active`, `is_admin`),
     INDEX `idx_email` (`email`),
     INDEX `idx_active` (`is_active`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Tabla de sesiones
 CREATE TABLE IF NOT EXISTS `sessions` (
-    `id` VARCHAR(36) PRIMARY KEY,
+    `id` VARCHAR(36) CHARACTER SET ascii COLLATE ascii_bin PRIMARY KEY,
     `user_id` INT NOT NULL,
     `ip_address` VARCHAR(45),
     `user_agent` TEXT,
@@ -37,7 +37,7 @@ CREATE TABLE IF NOT EXISTS `sessions` (
     `last_activity` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE CASCADE,
     INDEX `idx_user_id` (`user_id`),
-    INDEX `idx_active` (`is_active`),
+    INDEX `idx_active_expires` (`is_active`, `expires_at`),
     INDEX `idx_expires` (`expires_at`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
@@ -45,7 +45,7 @@ CREATE TABLE IF NOT EXISTS `sessions` (
 CREATE TABLE IF NOT EXISTS `history` (
     `id` INT AUTO_INCREMENT PRIMARY KEY,
     `user_id` INT,
-    `session_id` VARCHAR(36),
+    `session_id` VARCHAR(36) CHARACTER SET ascii COLLATE ascii_bin,
     `interaction_type` VARCHAR(50) NOT NULL,
     `user_message` TEXT,
     `agent_response` TEXT,
@@ -56,7 +56,7 @@ CREATE TABLE IF NOT EXISTS `history` (
     FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE SET NULL,
     FOREIGN KEY (`session_id`) REFERENCES `sessions`(`id`) ON DELETE SET NULL,
     INDEX `idx_user_id` (`user_id`),
-    INDEX `idx_session_id` (`session_id`),
+    INDEX `idx_session_time` (`session_id`, `created_at`),
     INDEX `idx_interaction_type` (`interaction_type`),
     INDEX `idx_created_at` (`created_at`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -69,19 +69,55 @@ CREATE TABLE IF NOT EXISTS `reports` (
     `file_path` VARCHAR(500) NOT NULL,
     `file_size` INT,
     `user_id` INT,
-    `session_id` VARCHAR(36),
+    `session_id` VARCHAR(36) CHARACTER SET ascii COLLATE ascii_bin,
     `summary` TEXT,
     `tags` JSON,
     `is_auto_generated` BOOLEAN DEFAULT FALSE,
     `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE SET NULL,
     FOREIGN KEY (`session_id`) REFERENCES `sessions`(`id`) ON DELETE SET NULL,
-    INDEX `idx_report_type` (`report_type`),
-    INDEX `idx_user_id` (`user_id`),
+    INDEX `idx_type_created` (`report_type`, `created_at`, `id`),
+    INDEX `idx_user_created` (`user_id`, `created_at`, `id`),
     INDEX `idx_created_at` (`created_at`),
-    INDEX `idx_auto_generated` (`is_auto_generated`)
+    INDEX `idx_auto_generated` (`is_auto_generated`),
+    FULLTEXT INDEX `idx_reports_fulltext` (`title`, `summary`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Resumen diario de reportes para estadísticas (mantenido por triggers)
+CREATE TABLE IF NOT EXISTS `reports_stats_daily` (
+    `stat_date` DATE NOT NULL,
+    `report_type` VARCHAR(50) NOT NULL,
+    `is_auto_generated` BOOLEAN NOT NULL,
+    `report_count` INT NOT NULL DEFAULT 0,
+    `sized_count` INT NOT NULL DEFAULT 0,
+    `total_bytes` BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (`stat_date`, `report_type`, `is_auto_generated`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+DROP TRIGGER IF EXISTS `trg_reports_stats_insert`;
+CREATE TRIGGER `trg_reports_stats_insert` AFTER INSERT ON `reports`
+FOR EACH ROW
+    INSERT INTO `reports_stats_daily`
+        (`stat_date`, `report_type`, `is_auto_generated`, `report_count`, `sized_count`, `total_bytes`)
+    VALUES
+        (DATE(NEW.`created_at`), NEW.`report_type`, COALESCE(NEW.`is_auto_generated`, FALSE),
+         1, NEW.`file_size` IS NOT NULL, COALESCE(NEW.`file_size`, 0))
+    ON DUPLICATE KEY UPDATE
+        `report_count` = `report_count` + 1,
+        `sized_count` = `sized_count` + VALUES(`sized_count`),
+        `total_bytes` = `total_bytes` + VALUES(`total_bytes`);
+
+DROP TRIGGER IF EXISTS `trg_reports_stats_delete`;
+CREATE TRIGGER `trg_reports_stats_delete` AFTER DELETE ON `reports`
+FOR EACH ROW
+    UPDATE `reports_stats_daily`
+    SET `report_count` = `report_count` - 1,
+        `sized_count` = `sized_count` - (OLD.`file_size` IS NOT NULL),
+        `total_bytes` = `total_bytes` - COALESCE(OLD.`file_size`, 0)
+    WHERE `stat_date` = DATE(OLD.`created_at`)
+    AND `report_type` = OLD.`report_type`
+    AND `is_auto_generated` = COALESCE(OLD.`is_auto_generated`, FALSE);
+
 -- Tabla de configuraciones del sistema
 CREATE TABLE IF NOT EXISTS `system_config` (
     `id` INT AUTO_INCREMENT PRIMARY KEY,
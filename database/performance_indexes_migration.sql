@@ -0,0 +1,30 @@
+-- Migración de índices de rendimiento para LiveChat-IA
+-- Aplica sobre instalaciones existentes los índices definidos en migrations.sql
+
+USE `livechat-ia`;
+
+-- Historial de una sesión en orden cronológico sin filesort
+-- (reemplaza a idx_session_id, que queda cubierto por el prefijo)
+CREATE INDEX `idx_session_time` ON `history` (`session_id`, `created_at`);
+DROP INDEX `idx_session_id` ON `history`;
+
+-- Búsqueda de texto en reportes mediante índice invertido
+-- (search_reports usa MATCH ... AGAINST en lugar de LIKE '%término%')
+ALTER TABLE `reports` ADD FULLTEXT INDEX `idx_reports_fulltext` (`title`, `summary`);
+
+-- Paginación por cursor (created_at, id) en listados por tipo y por usuario
+-- (reemplazan a idx_report_type e idx_user_id, cubiertos por el prefijo)
+CREATE INDEX `idx_type_created` ON `reports` (`report_type`, `created_at`, `id`);
+CREATE INDEX `idx_user_created` ON `reports` (`user_id`, `created_at`, `id`);
+DROP INDEX `idx_report_type` ON `reports`;
+DROP INDEX `idx_user_id` ON `reports`;
+
+-- Conteo de sesiones activas como rango sobre el índice
+-- (reemplaza a idx_active, cubierto por el prefijo)
+CREATE INDEX `idx_active_expires` ON `sessions` (`is_active`, `expires_at`);
+DROP INDEX `idx_active` ON `sessions`;
+
+-- Índice de cobertura para el login: la consulta de credenciales no lee la fila
+-- (reemplaza a idx_username; la unicidad la sigue garantizando la restricción UNIQUE)
+CREATE INDEX `idx_username_auth` ON `users` (`username`, `password_hash`, `is_active`, `is_admin`);
+DROP INDEX `idx_username` ON `users`;
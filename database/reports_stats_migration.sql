@@ -0,0 +1,128 @@
+-- Migración de la tabla resumen de estadísticas de reportes
+-- ReportModel.get_report_statistics agrega sobre esta tabla (una fila por
+-- día, tipo de reporte y origen) en lugar de recorrer toda la tabla reports.
+-- reports_stats_users guarda el número de reportes por usuario para contar
+-- los usuarios distintos sin COUNT(DISTINCT) sobre reports.
+-- Los triggers mantienen ambas tablas al insertar, modificar y eliminar reportes
+
+USE `livechat-ia`;
+
+CREATE TABLE IF NOT EXISTS `reports_stats_daily` (
+    `stat_date` DATE NOT NULL,
+    `report_type` VARCHAR(50) NOT NULL,
+    `is_auto_generated` BOOLEAN NOT NULL,
+    `report_count` INT NOT NULL DEFAULT 0,
+    `sized_count` INT NOT NULL DEFAULT 0,
+    `total_bytes` BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (`stat_date`, `report_type`, `is_auto_generated`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Carga inicial a partir de los reportes existentes
+INSERT INTO `reports_stats_daily`
+    (`stat_date`, `report_type`, `is_auto_generated`, `report_count`, `sized_count`, `total_bytes`)
+SELECT DATE(`created_at`), `report_type`, COALESCE(`is_auto_generated`, FALSE),
+       COUNT(*), COUNT(`file_size`), COALESCE(SUM(`file_size`), 0)
+FROM `reports`
+GROUP BY DATE(`created_at`), `report_type`, COALESCE(`is_auto_generated`, FALSE)
+ON DUPLICATE KEY UPDATE
+    `report_count` = VALUES(`report_count`),
+    `sized_count` = VALUES(`sized_count`),
+    `total_bytes` = VALUES(`total_bytes`);
+
+-- Reportes por usuario; la fila se elimina junto con el usuario (las acciones
+-- ON DELETE SET NULL de reports no disparan triggers)
+CREATE TABLE IF NOT EXISTS `reports_stats_users` (
+    `user_id` INT NOT NULL PRIMARY KEY,
+    `report_count` INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT INTO `reports_stats_users` (`user_id`, `report_count`)
+SELECT `user_id`, COUNT(*)
+FROM `reports`
+WHERE `user_id` IS NOT NULL
+GROUP BY `user_id`
+ON DUPLICATE KEY UPDATE `report_count` = VALUES(`report_count`);
+
+DROP TRIGGER IF EXISTS `trg_reports_stats_insert`;
+DROP TRIGGER IF EXISTS `trg_reports_stats_update`;
+DROP TRIGGER IF EXISTS `trg_reports_stats_delete`;
+
+DELIMITER $$
+
+CREATE TRIGGER `trg_reports_stats_insert` AFTER INSERT ON `reports`
+FOR EACH ROW
+BEGIN
+    INSERT INTO `reports_stats_daily`
+        (`stat_date`, `report_type`, `is_auto_generated`, `report_count`, `sized_count`, `total_bytes`)
+    VALUES
+        (DATE(NEW.`created_at`), NEW.`report_type`, COALESCE(NEW.`is_auto_generated`, FALSE),
+         1, NEW.`file_size` IS NOT NULL, COALESCE(NEW.`file_size`, 0))
+    ON DUPLICATE KEY UPDATE
+        `report_count` = `report_count` + 1,
+        `sized_count` = `sized_count` + VALUES(`sized_count`),
+        `total_bytes` = `total_bytes` + VALUES(`total_bytes`);
+
+    IF NEW.`user_id` IS NOT NULL THEN
+        INSERT INTO `reports_stats_users` (`user_id`, `report_count`)
+        VALUES (NEW.`user_id`, 1)
+        ON DUPLICATE KEY UPDATE `report_count` = `report_count` + 1;
+    END IF;
+END$$
+
+-- Una modificación resta la fila anterior y suma la nueva: el reporte puede
+-- cambiar de día, tipo, origen, tamaño o usuario
+CREATE TRIGGER `trg_reports_stats_update` AFTER UPDATE ON `reports`
+FOR EACH ROW
+BEGIN
+    UPDATE `reports_stats_daily`
+    SET `report_count` = `report_count` - 1,
+        `sized_count` = `sized_count` - (OLD.`file_size` IS NOT NULL),
+        `total_bytes` = `total_bytes` - COALESCE(OLD.`file_size`, 0)
+    WHERE `stat_date` = DATE(OLD.`created_at`)
+    AND `report_type` = OLD.`report_type`
+    AND `is_auto_generated` = COALESCE(OLD.`is_auto_generated`, FALSE);
+
+    INSERT INTO `reports_stats_daily`
+        (`stat_date`, `report_type`, `is_auto_generated`, `report_count`, `sized_count`, `total_bytes`)
+    VALUES
+        (DATE(NEW.`created_at`), NEW.`report_type`, COALESCE(NEW.`is_auto_generated`, FALSE),
+         1, NEW.`file_size` IS NOT NULL, COALESCE(NEW.`file_size`, 0))
+    ON DUPLICATE KEY UPDATE
+        `report_count` = `report_count` + 1,
+        `sized_count` = `sized_count` + VALUES(`sized_count`),
+        `total_bytes` = `total_bytes` + VALUES(`total_bytes`);
+
+    IF NOT (OLD.`user_id` <=> NEW.`user_id`) THEN
+        IF OLD.`user_id` IS NOT NULL THEN
+            UPDATE `reports_stats_users`
+            SET `report_count` = `report_count` - 1
+            WHERE `user_id` = OLD.`user_id`;
+        END IF;
+        IF NEW.`user_id` IS NOT NULL THEN
+            INSERT INTO `reports_stats_users` (`user_id`, `report_count`)
+            VALUES (NEW.`user_id`, 1)
+            ON DUPLICATE KEY UPDATE `report_count` = `report_count` + 1;
+        END IF;
+    END IF;
+END$$
+
+CREATE TRIGGER `trg_reports_stats_delete` AFTER DELETE ON `reports`
+FOR EACH ROW
+BEGIN
+    UPDATE `reports_stats_daily`
+    SET `report_count` = `report_count` - 1,
+        `sized_count` = `sized_count` - (OLD.`file_size` IS NOT NULL),
+        `total_bytes` = `total_bytes` - COALESCE(OLD.`file_size`, 0)
+    WHERE `stat_date` = DATE(OLD.`created_at`)
+    AND `report_type` = OLD.`report_type`
+    AND `is_auto_generated` = COALESCE(OLD.`is_auto_generated`, FALSE);
+
+    IF OLD.`user_id` IS NOT NULL THEN
+        UPDATE `reports_stats_users`
+        SET `report_count` = `report_count` - 1
+        WHERE `user_id` = OLD.`user_id`;
+    END IF;
+END$$
+
+DELIMITER ;
@@ -0,0 +1,26 @@
+-- Migración de los identificadores de sesión a ASCII binario
+-- Los nuevos IDs son tokens URL-safe de 24 caracteres (secrets.token_urlsafe);
+-- se conserva VARCHAR(36) para que los UUID existentes sigan siendo válidos.
+-- Con ascii_bin cada carácter ocupa un byte y las comparaciones en el índice
+-- son binarias, sin reglas de mayúsculas/minúsculas
+--
+-- Las columnas que referencian sessions.id deben compartir juego de caracteres
+-- y colación, por lo que se modifican todas con las claves foráneas desactivadas
+
+USE `livechat-ia`;
+
+SET FOREIGN_KEY_CHECKS = 0;
+
+ALTER TABLE `sessions`
+    MODIFY `id` VARCHAR(36) CHARACTER SET ascii COLLATE ascii_bin NOT NULL;
+
+ALTER TABLE `history`
+    MODIFY `session_id` VARCHAR(36) CHARACTER SET ascii COLLATE ascii_bin;
+
+ALTER TABLE `reports`
+    MODIFY `session_id` VARCHAR(36) CHARACTER SET ascii COLLATE ascii_bin;
+
+ALTER TABLE `agent_usage`
+    MODIFY `session_id` VARCHAR(36) CHARACTER SET ascii COLLATE ascii_bin;
+
+SET FOREIGN_KEY_CHECKS = 1;
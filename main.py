@@ -14,6 +14,8 @@ ctk.set_default_color_theme("blue")
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config.app_config import AppConfig
+from models.history_model import HistoryModel
+from utils.auth import auth_manager
 from components.layout.navbar import Navbar
 from components.layout.footer import AnimatedFooter
 from components.ui.chat_interface import ChatInterface
@@ -203,11 +205,19 @@ class LiveChatApp:
         self.root.quit()
         self.root.destroy()
 
+    def start_background_tasks(self):
+        """Inicia las tareas periódicas de mantenimiento en segundo plano"""
+        # Particiones mensuales del historial: crea las próximas y elimina las expiradas
+        HistoryModel().start_partition_maintenance()
+        # Sesiones expiradas: se marcan fuera del camino de cada petición
+        auth_manager.start_session_cleanup()
+
     def run(self):
         """Inicia la aplicación"""
         print(f"=== Iniciando {self.app_config.get_app_name()} ===")
         print(f"Entorno: {self.app_config.get_environment()}")
         print(f"Ventana: 1200x800 con padding del 10%")
+        self.start_background_tasks()
         print("=== Aplicación iniciada ===")
 
         self.root.mainloop()
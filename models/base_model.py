@@ -2,9 +2,29 @@
 # Contiene la configuración común de conexión a la base de datos
 # y métodos básicos de CRUD (Crear, Leer, Actualizar, Eliminar)
 
+import threading
 import mysql.connector
+from mysql.connector import pooling
 from config.database import DatabaseConfig
 
+# Pool de conexiones compartido por todos los modelos (se crea en el primer uso)
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_connection_pool():
+    """
+    Obtiene el pool de conexiones compartido, creándolo si no existe
+    Returns:
+        Pool de conexiones MySQL
+    """
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = pooling.MySQLConnectionPool(**DatabaseConfig().get_pool_config())
+    return _POOL
+
 
 class BaseModel:
     """
@@ -16,20 +36,91 @@ class BaseModel:
         # Inicializa la conexión a la base de datos usando la configuración
         self.db_config = DatabaseConfig()
         self.connection = None
+        self._connection_depth = 0
 
     def connect(self):
-        """Establece conexión con la base de datos MySQL"""
+        """
+        Obtiene una conexión del pool compartido
+        Si el modelo ya tiene una conexión abierta (llamadas anidadas) la reutiliza
+        """
+        if self.connection is not None:
+            self._connection_depth += 1
+            return self.connection
+
         try:
-            self.connection = mysql.connector.connect(**self.db_config.get_config())
+            self.connection = get_connection_pool().get_connection()
+            self._connection_depth = 1
             return self.connection
         except mysql.connector.Error as error:
             print(f"Error al conectar con la base de datos: {error}")
             return None
 
     def disconnect(self):
-        """Cierra la conexión con la base de datos"""
-        if self.connection and self.connection.is_connected():
+        """Devuelve la conexión al pool cuando termina la llamada más externa"""
+        if self.connection is None:
+            return
+
+        self._connection_depth -= 1
+        if self._connection_depth > 0:
+            return
+
+        try:
             self.connection.close()
+        finally:
+            self.connection = None
+            self._connection_depth = 0
+
+    def __enter__(self):
+        """
+        Obtiene una conexión del pool para un bloque with
+        Los bloques anidados comparten la misma conexión
+        """
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Devuelve la conexión al pool al salir del bloque más externo"""
+        self.disconnect()
+        return False
+
+    def get_prepared_cursor(self, query):
+        """
+        Obtiene un cursor preparado reutilizable para una consulta
+        El cursor se guarda en la conexión física (no en el envoltorio del pool),
+        de modo que el servidor solo analiza la sentencia la primera vez que se
+        ejecuta en ella. Las sentencias preparadas pertenecen a la sesión del
+        servidor, así que la caché se descarta cuando la conexión se restablece
+        (cambia su connection_id)
+        Args:
+            query: Consulta SQL con marcadores %s
+        Returns:
+            Cursor preparado asociado a la consulta
+        """
+        connection = getattr(self.connection, '_cnx', self.connection)
+        connection_id = connection.connection_id
+
+        cached = getattr(connection, '_prepared_statements', None)
+        if cached is None or cached[0] != connection_id:
+            statements = {}
+            connection._prepared_statements = (connection_id, statements)
+        else:
+            statements = cached[1]
+
+        cursor = statements.get(query)
+        if cursor is None:
+            cursor = connection.cursor(prepared=True)
+            statements[query] = cursor
+
+        return cursor
+
+    def discard_prepared_cursors(self):
+        """
+        Olvida los cursores preparados de la conexión actual
+        Se usa tras un error, cuando la sesión del servidor pudo perderse
+        """
+        connection = getattr(self.connection, '_cnx', self.connection)
+        if connection is not None:
+            connection._prepared_statements = None
 
     def execute_query(self, query, params=None):
         """
@@ -48,4 +139,54 @@ class BaseModel:
             return result
         except mysql.connector.Error as error:
             print(f"Error al ejecutar consulta: {error}")
-            return None
\ No newline at end of file
+            return None
+
+    def execute_prepared_query(self, query, params=None):
+        """
+        Ejecuta una consulta con un cursor preparado reutilizable
+        Args:
+            query: Consulta SQL con marcadores %s
+            params: Parámetros para la consulta (opcional)
+        Returns:
+            Lista de filas como diccionarios o None si hay error
+        """
+        try:
+            cursor = self.get_prepared_cursor(query)
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            names = cursor.column_names
+            return [dict(zip(names, row)) for row in rows]
+        except mysql.connector.Error as error:
+            self.discard_prepared_cursors()
+            print(f"Error al ejecutar consulta: {error}")
+            return None
+
+    def execute_query_columnar(self, query, params=None, columns=None):
+        """
+        Ejecuta una consulta y devuelve el resultado organizado por columnas
+        Evita crear un diccionario por fila en resultados grandes
+        Args:
+            query: Consulta SQL a ejecutar
+            params: Parámetros para la consulta (opcional)
+            columns: Columnas a devolver (por defecto todas)
+        Returns:
+            Diccionario {columna: lista de valores} o None si hay error
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            names = cursor.column_names
+            cursor.close()
+
+            # Transponer filas a columnas en una sola pasada en C
+            values = [list(column) for column in zip(*rows)] if rows else [[] for _ in names]
+            result = dict(zip(names, values))
+
+            if columns:
+                result = {name: result[name] for name in columns}
+
+            return result
+        except mysql.connector.Error as error:
+            print(f"Error al ejecutar consulta: {error}")
+            return None
@@ -1,11 +1,35 @@
 # Modelo de historial
 # Gestiona el historial de interacciones entre usuarios y agentes
 
+import copy
 import json
+import time
+import threading
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+from operator import itemgetter
+from typing import Optional, Dict, List, Any, Iterator, Tuple
+import orjson
+from cachetools import TTLCache
 from .base_model import BaseModel
 
+# Caché de estadísticas por rango de fechas (60 segundos)
+_stats_cache = TTLCache(maxsize=64, ttl=60)
+_stats_cache_lock = threading.Lock()
+
+# Extractores de pares (clave, valor) para construir diccionarios de estadísticas
+_type_count_pair = itemgetter('interaction_type', 'count')
+_date_count_pair = itemgetter('date', 'count')
+
+
+def _parse_metadata(raw):
+    """Decodifica los metadatos JSON de una fila (None si no tiene)"""
+    if not raw:
+        return raw
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return {}
+
 
 class HistoryModel(BaseModel):
     """
@@ -54,17 +78,16 @@ class HistoryModel(BaseModel):
 
             metadata_json = json.dumps(metadata) if metadata else None
 
-            cursor = self.connection.cursor()
+            # La conexión usa autocommit (ver DatabaseConfig), por lo que
+            # cada sentencia se confirma sin un COMMIT explícito adicional.
+            # El cursor preparado se reutiliza mientras viva la conexión
+            cursor = self.get_prepared_cursor(query)
             cursor.execute(query, (
                 user_id, session_id, interaction_type, user_message,
                 agent_response, response_time_ms, tokens_used, metadata_json
             ))
-            self.connection.commit()
 
-            interaction_id = cursor.lastrowid
-            cursor.close()
-
-            return interaction_id
+            return cursor.lastrowid
 
         except Exception as error:
             print(f"Error al crear interacción: {error}")
@@ -110,14 +133,11 @@ class HistoryModel(BaseModel):
 
             result = self.execute_query(query, params)
 
-            # Procesar metadatos JSON
+            # Metadatos JSON decodificados con orjson
             if result:
                 for interaction in result:
                     if interaction['metadata']:
-                        try:
-                            interaction['metadata'] = json.loads(interaction['metadata'])
-                        except json.JSONDecodeError:
-                            interaction['metadata'] = {}
+                        interaction['metadata'] = _parse_metadata(interaction['metadata'])
 
             return result if result else []
 
@@ -127,18 +147,48 @@ class HistoryModel(BaseModel):
         finally:
             self.disconnect()
 
-    def get_session_interactions(
+    def _iter_interactions_unbuffered(self, query: str, params: list) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre el resultado de una consulta de historial con un cursor sin buffer
+        Si el llamador abandona el recorrido (break, islice, recolección del
+        generador) las filas pendientes se descartan antes de cerrar el cursor:
+        la conexión vuelve al pool sin reiniciar la sesión y no puede llevar
+        un resultado sin leer
+        Args:
+            query: Consulta SQL con marcadores %s
+            params: Parámetros de la consulta
+        Yields:
+            Filas con los metadatos JSON decodificados
+        """
+        cursor = self.connection.cursor(dictionary=True, buffered=False)
+        try:
+            cursor.execute(query, params)
+
+            for interaction in cursor:
+                # Metadatos JSON decodificados con orjson
+                if interaction['metadata']:
+                    interaction['metadata'] = _parse_metadata(interaction['metadata'])
+                yield interaction
+        finally:
+            try:
+                self.connection.consume_results()
+            finally:
+                cursor.close()
+
+    def iter_session_interactions(
         self,
         session_id: str,
         interaction_type: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Obtiene las interacciones de una sesión específica
+        Recorre las interacciones de una sesión en orden cronológico
+        El índice (session_id, created_at) entrega las filas ya ordenadas, por lo
+        que se leen con un cursor sin buffer a medida que MySQL las envía
         Args:
             session_id: ID de la sesión
             interaction_type: Filtrar por tipo de interacción
-        Returns:
-            Lista de interacciones de la sesión
+        Yields:
+            Interacciones de la sesión, una a una
         """
         try:
             self.connect()
@@ -158,22 +208,71 @@ class HistoryModel(BaseModel):
 
             query += " ORDER BY created_at ASC"
 
-            result = self.execute_query(query, params)
+            yield from self._iter_interactions_unbuffered(query, params)
 
-            # Procesar metadatos JSON
-            if result:
-                for interaction in result:
-                    if interaction['metadata']:
-                        try:
-                            interaction['metadata'] = json.loads(interaction['metadata'])
-                        except json.JSONDecodeError:
-                            interaction['metadata'] = {}
+        except Exception as error:
+            print(f"Error al obtener interacciones de sesión: {error}")
+        finally:
+            self.disconnect()
 
-            return result if result else []
+    def get_session_interactions(
+        self,
+        session_id: str,
+        interaction_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Obtiene las interacciones de una sesión específica
+        Args:
+            session_id: ID de la sesión
+            interaction_type: Filtrar por tipo de interacción
+        Returns:
+            Lista de interacciones de la sesión
+        """
+        return list(self.iter_session_interactions(session_id, interaction_type))
+
+    def iter_interactions_by_date(
+        self,
+        start_date: datetime,
+        end_date: Optional[datetime] = None,
+        interaction_type: Optional[str] = None,
+        limit: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre interacciones por rango de fechas sin materializar la lista completa
+        Usa un cursor sin buffer para que las filas se procesen mientras MySQL las envía
+        Args:
+            start_date: Fecha de inicio
+            end_date: Fecha de fin (por defecto hoy)
+            interaction_type: Filtrar por tipo de interacción
+            limit: Número máximo de resultados
+        Yields:
+            Interacciones en el rango de fechas, una a una
+        """
+        try:
+            self.connect()
+
+            if not end_date:
+                end_date = datetime.now()
+
+            query = """
+                SELECT h.*, u.username
+                FROM history h
+                LEFT JOIN users u ON h.user_id = u.id
+                WHERE h.created_at BETWEEN %s AND %s
+            """
+            params = [start_date, end_date]
+
+            if interaction_type:
+                query += " AND h.interaction_type = %s"
+                params.append(interaction_type)
+
+            query += " ORDER BY h.created_at DESC LIMIT %s"
+            params.append(limit)
+
+            yield from self._iter_interactions_unbuffered(query, params)
 
         except Exception as error:
-            print(f"Error al obtener interacciones de sesión: {error}")
-            return []
+            print(f"Error al obtener interacciones por fecha: {error}")
         finally:
             self.disconnect()
 
@@ -194,6 +293,29 @@ class HistoryModel(BaseModel):
         Returns:
             Lista de interacciones en el rango de fechas
         """
+        return list(self.iter_interactions_by_date(
+            start_date, end_date, interaction_type, limit
+        ))
+
+    def get_interactions_by_date_columnar(
+        self,
+        start_date: datetime,
+        end_date: Optional[datetime] = None,
+        interaction_type: Optional[str] = None,
+        limit: int = 100
+    ) -> Dict[str, List[Any]]:
+        """
+        Obtiene interacciones por rango de fechas organizadas por columnas
+        Pensado para exportaciones: una lista por columna en lugar de un
+        diccionario por fila reduce memoria y acelera el procesamiento
+        Args:
+            start_date: Fecha de inicio
+            end_date: Fecha de fin (por defecto hoy)
+            interaction_type: Filtrar por tipo de interacción
+            limit: Número máximo de resultados
+        Returns:
+            Diccionario {columna: lista de valores}, vacío si hay error
+        """
         try:
             self.connect()
 
@@ -215,22 +337,16 @@ class HistoryModel(BaseModel):
             query += " ORDER BY h.created_at DESC LIMIT %s"
             params.append(limit)
 
-            result = self.execute_query(query, params)
-
-            # Procesar metadatos JSON
-            if result:
-                for interaction in result:
-                    if interaction['metadata']:
-                        try:
-                            interaction['metadata'] = json.loads(interaction['metadata'])
-                        except json.JSONDecodeError:
-                            interaction['metadata'] = {}
+            columns = self.execute_query_columnar(query, params)
+            if not columns:
+                return {}
 
-            return result if result else []
+            columns['metadata'] = list(map(_parse_metadata, columns['metadata']))
+            return columns
 
         except Exception as error:
             print(f"Error al obtener interacciones por fecha: {error}")
-            return []
+            return {}
         finally:
             self.disconnect()
 
@@ -247,14 +363,24 @@ class HistoryModel(BaseModel):
         Returns:
             Diccionario con estadísticas
         """
+        if not end_date:
+            end_date = datetime.now()
+        if not start_date:
+            start_date = end_date - timedelta(days=30)
+
+        # El dashboard consulta repetidamente el mismo rango: se agrupa por minuto
+        cache_key = (
+            start_date.replace(second=0, microsecond=0),
+            end_date.replace(second=0, microsecond=0)
+        )
+        with _stats_cache_lock:
+            cached_stats = _stats_cache.get(cache_key)
+        if cached_stats is not None:
+            return copy.deepcopy(cached_stats)
+
         try:
             self.connect()
 
-            if not end_date:
-                end_date = datetime.now()
-            if not start_date:
-                start_date = end_date - timedelta(days=30)
-
             # Estadísticas básicas
             stats_query = """
                 SELECT
@@ -281,10 +407,7 @@ class HistoryModel(BaseModel):
             """
 
             type_result = self.execute_query(type_query, (start_date, end_date))
-            stats['interaction_types'] = {
-                row['interaction_type']: row['count']
-                for row in (type_result if type_result else [])
-            }
+            stats['interaction_types'] = dict(map(_type_count_pair, type_result or ()))
 
             # Estadísticas por día
             daily_query = """
@@ -297,12 +420,15 @@ class HistoryModel(BaseModel):
             """
 
             daily_result = self.execute_query(daily_query, (start_date, end_date))
-            stats['daily_counts'] = {
-                str(row['date']): row['count']
-                for row in (daily_result if daily_result else [])
-            }
+            stats['daily_counts'] = dict(
+                (str(date), count)
+                for date, count in map(_date_count_pair, daily_result or ())
+            )
 
-            return stats
+            with _stats_cache_lock:
+                _stats_cache[cache_key] = stats
+
+            return copy.deepcopy(stats)
 
         except Exception as error:
             print(f"Error al obtener estadísticas: {error}")
@@ -310,11 +436,20 @@ class HistoryModel(BaseModel):
         finally:
             self.disconnect()
 
-    def delete_old_interactions(self, days_to_keep: int = 90) -> int:
+    def delete_old_interactions(
+        self,
+        days_to_keep: int = 90,
+        batch_size: int = 10000,
+        pause_seconds: float = 0.01
+    ) -> int:
         """
         Elimina interacciones antiguas para mantener el tamaño de la base de datos
+        El borrado se hace por lotes acotados para no mantener bloqueos largos
+        ni generar transacciones enormes en el binlog
         Args:
             days_to_keep: Días de historial a mantener
+            batch_size: Máximo de filas eliminadas por sentencia
+            pause_seconds: Pausa entre lotes para dejar respirar a las réplicas
         Returns:
             Número de interacciones eliminadas
         """
@@ -323,13 +458,25 @@ class HistoryModel(BaseModel):
 
             cutoff_date = datetime.now() - timedelta(days=days_to_keep)
 
-            query = "DELETE FROM history WHERE created_at < %s"
+            # Si la tabla está particionada, los meses completamente expirados
+            # se eliminan con DROP PARTITION sin recorrer sus filas
+            deleted_count = self._drop_expired_partitions(cutoff_date)
+
+            # El resto (mes parcialmente expirado o tabla sin particionar)
+            # se elimina fila a fila por lotes
+            query = "DELETE FROM history WHERE created_at < %s ORDER BY id LIMIT %s"
 
             cursor = self.connection.cursor()
-            cursor.execute(query, (cutoff_date,))
-            self.connection.commit()
+            while True:
+                cursor.execute(query, (cutoff_date, batch_size))
+                batch_deleted = cursor.rowcount
+                deleted_count += batch_deleted
+
+                if batch_deleted < batch_size:
+                    break
 
-            deleted_count = cursor.rowcount
+                if pause_seconds:
+                    time.sleep(pause_seconds)
             cursor.close()
 
             if deleted_count > 0:
@@ -343,6 +490,149 @@ class HistoryModel(BaseModel):
         finally:
             self.disconnect()
 
+    def _drop_expired_partitions(self, cutoff_date: datetime) -> int:
+        """
+        Elimina las particiones mensuales cuyo rango completo es anterior al corte
+        Requiere una conexión abierta
+        Args:
+            cutoff_date: Fecha de corte
+        Returns:
+            Número aproximado de filas eliminadas (estimación de InnoDB)
+        """
+        query = """
+            SELECT partition_name AS name, table_rows AS row_estimate
+            FROM information_schema.partitions
+            WHERE table_schema = DATABASE()
+            AND table_name = %s
+            AND partition_name IS NOT NULL
+            AND partition_description != 'MAXVALUE'
+            AND CAST(partition_description AS UNSIGNED) <= UNIX_TIMESTAMP(%s)
+        """
+
+        expired = self.execute_query(query, (self.table_name, cutoff_date))
+        if not expired:
+            return 0
+
+        names = ', '.join(f"`{partition['name']}`" for partition in expired)
+
+        cursor = self.connection.cursor()
+        cursor.execute(f"ALTER TABLE history DROP PARTITION {names}")
+        cursor.close()
+
+        print(f"Particiones de historial eliminadas: {names}")
+        return sum(partition['row_estimate'] or 0 for partition in expired)
+
+    def _create_month_partition(self, month_start: datetime) -> bool:
+        """
+        Crea la partición de un mes separándola de la partición p_future
+        Requiere una conexión abierta
+        Args:
+            month_start: Primer día del mes a crear
+        Returns:
+            True si la partición se creó, False si ya existía
+        """
+        partition_name = month_start.strftime('p%Y%m')
+        next_month = (month_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+        query = """
+            SELECT partition_name AS name
+            FROM information_schema.partitions
+            WHERE table_schema = DATABASE()
+            AND table_name = %s
+            AND partition_name = %s
+        """
+        if self.execute_query(query, (self.table_name, partition_name)):
+            return False
+
+        reorganize_query = f"""
+            ALTER TABLE history REORGANIZE PARTITION p_future INTO (
+                PARTITION {partition_name} VALUES LESS THAN (UNIX_TIMESTAMP(%s)),
+                PARTITION p_future VALUES LESS THAN MAXVALUE
+            )
+        """
+
+        cursor = self.connection.cursor()
+        cursor.execute(reorganize_query, (next_month.strftime('%Y-%m-%d %H:%M:%S'),))
+        cursor.close()
+
+        print(f"Partición de historial creada: {partition_name}")
+        return True
+
+    def maintain_partitions(self, days_to_keep: int = 90, months_ahead: int = 1) -> Dict[str, int]:
+        """
+        Mantiene las particiones mensuales del historial
+        Crea las particiones de los próximos meses y elimina las expiradas
+        Args:
+            days_to_keep: Días de historial a mantener
+            months_ahead: Meses futuros para los que se crea partición
+        Returns:
+            Diccionario con particiones creadas y filas eliminadas
+        """
+        summary = {'created': 0, 'dropped_rows': 0}
+
+        try:
+            self.connect()
+
+            query = """
+                SELECT COUNT(*) as count
+                FROM information_schema.partitions
+                WHERE table_schema = DATABASE()
+                AND table_name = %s
+                AND partition_name IS NOT NULL
+            """
+            result = self.execute_query(query, (self.table_name,))
+            if not result or not result[0]['count']:
+                return summary  # Tabla sin particionar
+
+            month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            for _ in range(months_ahead + 1):
+                if self._create_month_partition(month_start):
+                    summary['created'] += 1
+                month_start = (month_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+            cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+            summary['dropped_rows'] = self._drop_expired_partitions(cutoff_date)
+
+            return summary
+
+        except Exception as error:
+            print(f"Error al mantener particiones del historial: {error}")
+            return summary
+        finally:
+            self.disconnect()
+
+    def start_partition_maintenance(
+        self,
+        days_to_keep: int = 90,
+        interval_seconds: int = 24 * 60 * 60,
+        delay_seconds: float = 0,
+        worker: Optional['HistoryModel'] = None
+    ) -> threading.Timer:
+        """
+        Programa el mantenimiento periódico de particiones en segundo plano
+        La primera ejecución es inmediata (en el hilo del temporizador): una sesión
+        de escritorio rara vez dura el intervalo completo
+        Args:
+            days_to_keep: Días de historial a mantener
+            interval_seconds: Intervalo entre ejecuciones
+            delay_seconds: Espera antes de esta ejecución
+            worker: Instancia que ejecuta el mantenimiento (se crea en la primera llamada)
+        Returns:
+            Temporizador programado
+        """
+        # Instancia propia para no compartir la conexión con otros hilos
+        if worker is None:
+            worker = HistoryModel()
+
+        def run_maintenance():
+            worker.maintain_partitions(days_to_keep)
+            self.start_partition_maintenance(days_to_keep, interval_seconds, interval_seconds, worker)
+
+        timer = threading.Timer(delay_seconds, run_maintenance)
+        timer.daemon = True
+        timer.start()
+        return timer
+
     def get_popular_queries(
         self,
         limit: int = 10,
@@ -434,7 +724,6 @@ class HistoryModel(BaseModel):
 
             cursor = self.connection.cursor()
             cursor.execute(query, params)
-            self.connection.commit()
 
             affected_rows = cursor.rowcount
             cursor.close()
@@ -445,4 +734,81 @@ class HistoryModel(BaseModel):
             print(f"Error al actualizar interacción: {error}")
             return False
         finally:
-            self.disconnect()
\ No newline at end of file
+            self.disconnect()
+
+    def update_interactions_bulk(
+        self,
+        updates: List[Tuple[int, Dict[str, Any]]],
+        batch_size: int = 500
+    ) -> int:
+        """
+        Actualiza varias interacciones con una sola sentencia por lote
+        Los valores se cruzan con la tabla mediante una tabla derivada, de modo
+        que N actualizaciones cuestan un viaje a la base de datos por lote
+        Args:
+            updates: Lista de (interaction_id, campos). Los campos admitidos son
+                     agent_response, response_time_ms, tokens_used y metadata;
+                     los omitidos o None conservan su valor actual
+            batch_size: Máximo de interacciones por sentencia
+        Returns:
+            Número de interacciones actualizadas
+        """
+        if not updates:
+            return 0
+
+        try:
+            self.connect()
+
+            first_row = (
+                "SELECT %s AS id, %s AS agent_response, %s AS response_time_ms, "
+                "%s AS tokens_used, %s AS metadata"
+            )
+            next_row = "SELECT %s, %s, %s, %s, %s"
+
+            updated_count = 0
+            cursor = self.connection.cursor()
+
+            # El conjunto de lotes se aplica de forma atómica
+            self.connection.start_transaction()
+
+            for start in range(0, len(updates), batch_size):
+                batch = updates[start:start + batch_size]
+
+                params = []
+                for interaction_id, fields in batch:
+                    metadata = fields.get('metadata')
+                    params.extend((
+                        interaction_id,
+                        fields.get('agent_response'),
+                        fields.get('response_time_ms'),
+                        fields.get('tokens_used'),
+                        json.dumps(metadata) if metadata is not None else None
+                    ))
+
+                values_table = " UNION ALL ".join([first_row] + [next_row] * (len(batch) - 1))
+                query = f"""
+                    UPDATE history h
+                    JOIN ({values_table}) u ON h.id = u.id
+                    SET h.agent_response = COALESCE(u.agent_response, h.agent_response),
+                        h.response_time_ms = COALESCE(u.response_time_ms, h.response_time_ms),
+                        h.tokens_used = COALESCE(u.tokens_used, h.tokens_used),
+                        h.metadata = COALESCE(CAST(u.metadata AS JSON), h.metadata)
+                """
+
+                cursor.execute(query, params)
+                updated_count += cursor.rowcount
+
+            self.connection.commit()
+            cursor.close()
+
+            return updated_count
+
+        except Exception as error:
+            print(f"Error al actualizar interacciones en lote: {error}")
+            try:
+                self.connection.rollback()
+            except Exception:
+                pass
+            return 0
+        finally:
+            self.disconnect()
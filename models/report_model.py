@@ -2,11 +2,135 @@
 # Gestiona los metadatos y archivos de reportes del sistema
 
 import os
-import json
-from datetime import datetime
+import copy
+import threading
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any
+from cachetools import TTLCache
 from .base_model import BaseModel
 
+# Caché de estadísticas de reportes (60 segundos)
+_stats_cache = TTLCache(maxsize=4, ttl=60)
+_stats_cache_lock = threading.Lock()
+# Serializa el cálculo para que una caché vacía no dispare consultas simultáneas
+_stats_lock = threading.Lock()
+
+# Columnas devueltas por defecto en los listados (sin summary ni tags)
+_REPORT_SUMMARY_COLS = (
+    "r.id, r.report_type, r.title, r.file_path, r.file_size, "
+    "r.created_at, r.is_auto_generated, r.user_id"
+)
+
+# Columnas que se pueden solicitar explícitamente con el parámetro fields
+_REPORT_COLUMNS = (
+    'id', 'report_type', 'title', 'file_path', 'file_size', 'user_id',
+    'session_id', 'summary', 'tags', 'is_auto_generated', 'created_at'
+)
+
+
+# Consultas base de los listados: sin JOIN o con el nombre del autor
+_BASE_QUERY_NO_JOIN = """
+                SELECT {columns}
+                FROM reports r
+"""
+_BASE_QUERY_WITH_USER = """
+                SELECT {columns}, u.username as created_by_username
+                FROM reports r
+                LEFT JOIN users u ON r.user_id = u.id
+"""
+
+
+def _report_projection(fields: Optional[List[str]]) -> str:
+    """
+    Construye la lista de columnas a seleccionar de la tabla reports
+    Args:
+        fields: Columnas solicitadas (None usa las columnas de resumen)
+    Returns:
+        Fragmento SQL con las columnas
+    """
+    if not fields:
+        return _REPORT_SUMMARY_COLS
+
+    invalid = [field for field in fields if field not in _REPORT_COLUMNS]
+    if invalid:
+        raise ValueError(f"Columnas de reporte no válidas: {', '.join(invalid)}")
+
+    return ', '.join(f"r.{field}" for field in fields)
+
+
+def _report_select(fields: Optional[List[str]], with_username: bool) -> str:
+    """
+    Construye el SELECT ... FROM de los listados de reportes
+    Args:
+        fields: Columnas solicitadas (None usa las columnas de resumen)
+        with_username: Si incluir el nombre del autor (requiere JOIN con users)
+    Returns:
+        Fragmento SQL sin cláusula WHERE
+    """
+    base_query = _BASE_QUERY_WITH_USER if with_username else _BASE_QUERY_NO_JOIN
+    return base_query.format(columns=_report_projection(fields))
+
+
+def _remove_file(file_path: str) -> None:
+    """
+    Elimina un archivo ignorando los que ya no existen o no se pueden borrar
+    Args:
+        file_path: Ruta del archivo
+    """
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+
+
+def _paginate(rows: Optional[List[Dict[str, Any]]], limit: int) -> Dict[str, Any]:
+    """
+    Construye la respuesta paginada por cursor (created_at, id)
+    Args:
+        rows: Filas de la página actual
+        limit: Tamaño de página solicitado
+    Returns:
+        Diccionario con 'data' y 'next_cursor' (None si no hay más páginas)
+    """
+    rows = rows or []
+    next_cursor = None
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        next_cursor = {'after_created_at': last['created_at'], 'after_id': last['id']}
+
+    return {'data': rows, 'next_cursor': next_cursor}
+
+
+def _decode_tags(raw_tags) -> List[str]:
+    """
+    Decodifica la columna tags de un reporte
+    Args:
+        raw_tags: Valor JSON leído de la base de datos
+    Returns:
+        Lista de etiquetas (vacía si el JSON no es válido)
+    """
+    try:
+        return orjson.loads(raw_tags)
+    except orjson.JSONDecodeError:
+        return []
+
+
+def _hydrate_tags(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Decodifica en el lugar la columna tags de varias filas de reportes
+    Args:
+        rows: Filas de reportes
+    Returns:
+        Las mismas filas con tags decodificados
+    """
+    for row in rows:
+        raw_tags = row.get('tags')
+        if raw_tags:
+            row['tags'] = _decode_tags(raw_tags)
+    return rows
+
 
 class ReportModel(BaseModel):
     """
@@ -52,7 +176,7 @@ class ReportModel(BaseModel):
                 file_size = os.path.getsize(file_path)
 
             # Convertir tags a JSON
-            tags_json = json.dumps(tags) if tags else None
+            tags_json = orjson.dumps(tags).decode() if tags else None
 
             query = """
                 INSERT INTO reports (
@@ -79,6 +203,79 @@ class ReportModel(BaseModel):
         finally:
             self.disconnect()
 
+    def create_report_records(
+        self,
+        rows: List[Dict[str, Any]],
+        batch_size: int = 500
+    ) -> int:
+        """
+        Crea varios registros de reporte con un INSERT multi-fila por lote
+        Args:
+            rows: Lista de reportes con las mismas claves que los argumentos de
+                  create_report_record (report_type, title y file_path obligatorias)
+            batch_size: Máximo de reportes por sentencia
+        Returns:
+            Número de registros creados
+        """
+        if not rows:
+            return 0
+
+        try:
+            self.connect()
+
+            columns = """
+                INSERT INTO reports (
+                    report_type, title, file_path, file_size, user_id,
+                    session_id, summary, tags, is_auto_generated
+                ) VALUES
+            """
+            placeholder = "(%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+
+            created_count = 0
+            cursor = self.connection.cursor()
+
+            # El conjunto de lotes se inserta de forma atómica
+            self.connection.start_transaction()
+
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+
+                params = []
+                for row in batch:
+                    file_path = row['file_path']
+                    file_size = os.path.getsize(file_path) if os.path.exists(file_path) else None
+                    tags = row.get('tags')
+                    params.extend((
+                        row['report_type'],
+                        row['title'],
+                        file_path,
+                        file_size,
+                        row.get('user_id'),
+                        row.get('session_id'),
+                        row.get('summary'),
+                        orjson.dumps(tags).decode() if tags else None,
+                        row.get('is_auto_generated', True)
+                    ))
+
+                query = columns + ", ".join([placeholder] * len(batch))
+                cursor.execute(query, params)
+                created_count += cursor.rowcount
+
+            self.connection.commit()
+            cursor.close()
+
+            return created_count
+
+        except Exception as error:
+            print(f"Error al crear registros de reporte en lote: {error}")
+            try:
+                self.connection.rollback()
+            except Exception:
+                pass
+            return 0
+        finally:
+            self.disconnect()
+
     def get_report_by_id(self, report_id: int) -> Optional[Dict[str, Any]]:
         """
         Obtiene un reporte por su ID
@@ -100,14 +297,7 @@ class ReportModel(BaseModel):
             result = self.execute_query(query, (report_id,))
 
             if result:
-                report = result[0]
-                # Procesar tags JSON
-                if report['tags']:
-                    try:
-                        report['tags'] = json.loads(report['tags'])
-                    except json.JSONDecodeError:
-                        report['tags'] = []
-                return report
+                return _hydrate_tags(result)[0]
 
             return None
 
@@ -121,16 +311,20 @@ class ReportModel(BaseModel):
         self,
         report_type: str,
         limit: int = 50,
-        offset: int = 0
-    ) -> List[Dict[str, Any]]:
+        offset: int = 0,
+        after_created_at: Optional[datetime] = None,
+        after_id: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Obtiene reportes por tipo
         Args:
             report_type: Tipo de reporte
             limit: Número máximo de resultados
-            offset: Desplazamiento para paginación
+            offset: Desplazamiento para paginación (solo sin cursor)
+            after_created_at: Fecha del último reporte de la página anterior
+            after_id: ID del último reporte de la página anterior
         Returns:
-            Lista de reportes del tipo especificado
+            Diccionario con los reportes ('data') y el cursor de la página siguiente ('next_cursor')
         """
         try:
             self.connect()
@@ -141,16 +335,30 @@ class ReportModel(BaseModel):
                 FROM reports r
                 LEFT JOIN users u ON r.user_id = u.id
                 WHERE r.report_type = %s
-                ORDER BY r.created_at DESC
-                LIMIT %s OFFSET %s
             """
+            params = [report_type]
+
+            if after_created_at is not None and after_id is not None:
+                # Paginación por cursor: continúa tras la última fila vista.
+                # Se expande la comparación de tuplas (que MySQL no siempre convierte
+                # en rango) y la cota created_at <= %s fija el rango sobre el índice
+                query += (
+                    " AND r.created_at <= %s"
+                    " AND (r.created_at < %s OR (r.created_at = %s AND r.id < %s))"
+                )
+                params.extend([after_created_at, after_created_at, after_created_at, after_id])
+                query += " ORDER BY r.created_at DESC, r.id DESC LIMIT %s"
+                params.append(limit)
+            else:
+                query += " ORDER BY r.created_at DESC, r.id DESC LIMIT %s OFFSET %s"
+                params.extend([limit, offset])
 
-            result = self.execute_query(query, (report_type, limit, offset))
-            return result if result else []
+            result = self.execute_query(query, params)
+            return _paginate(result, limit)
 
         except Exception as error:
             print(f"Error al obtener reportes por tipo: {error}")
-            return []
+            return _paginate(None, limit)
         finally:
             self.disconnect()
 
@@ -158,7 +366,9 @@ class ReportModel(BaseModel):
         self,
         start_date: datetime,
         end_date: Optional[datetime] = None,
-        report_type: Optional[str] = None
+        report_type: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        with_username: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Obtiene reportes por rango de fechas
@@ -166,6 +376,8 @@ class ReportModel(BaseModel):
             start_date: Fecha de inicio
             end_date: Fecha de fin (por defecto hoy)
             report_type: Filtrar por tipo de reporte
+            fields: Columnas a devolver (por defecto las de resumen)
+            with_username: Si incluir created_by_username (añade JOIN con users)
         Returns:
             Lista de reportes en el rango de fechas
         """
@@ -175,10 +387,7 @@ class ReportModel(BaseModel):
             if not end_date:
                 end_date = datetime.now()
 
-            query = """
-                SELECT r.*, u.username as created_by_username
-                FROM reports r
-                LEFT JOIN users u ON r.user_id = u.id
+            query = _report_select(fields, with_username) + """
                 WHERE r.created_at BETWEEN %s AND %s
             """
             params = [start_date, end_date]
@@ -191,16 +400,11 @@ class ReportModel(BaseModel):
 
             result = self.execute_query(query, params)
 
-            # Procesar tags JSON
-            if result:
-                for report in result:
-                    if report['tags']:
-                        try:
-                            report['tags'] = json.loads(report['tags'])
-                        except json.JSONDecodeError:
-                            report['tags'] = []
+            if not result:
+                return []
 
-            return result if result else []
+            # Tags JSON decodificados con orjson
+            return _hydrate_tags(result)
 
         except Exception as error:
             print(f"Error al obtener reportes por fecha: {error}")
@@ -212,16 +416,20 @@ class ReportModel(BaseModel):
         self,
         user_id: int,
         limit: int = 20,
-        offset: int = 0
-    ) -> List[Dict[str, Any]]:
+        offset: int = 0,
+        after_created_at: Optional[datetime] = None,
+        after_id: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Obtiene reportes de un usuario específico
         Args:
             user_id: ID del usuario
             limit: Número máximo de resultados
-            offset: Desplazamiento para paginación
+            offset: Desplazamiento para paginación (solo sin cursor)
+            after_created_at: Fecha del último reporte de la página anterior
+            after_id: ID del último reporte de la página anterior
         Returns:
-            Lista de reportes del usuario
+            Diccionario con los reportes ('data') y el cursor de la página siguiente ('next_cursor')
         """
         try:
             self.connect()
@@ -231,16 +439,30 @@ class ReportModel(BaseModel):
                        summary, created_at, is_auto_generated
                 FROM reports
                 WHERE user_id = %s
-                ORDER BY created_at DESC
-                LIMIT %s OFFSET %s
             """
+            params = [user_id]
+
+            if after_created_at is not None and after_id is not None:
+                # Paginación por cursor: continúa tras la última fila vista.
+                # Se expande la comparación de tuplas (que MySQL no siempre convierte
+                # en rango) y la cota created_at <= %s fija el rango sobre el índice
+                query += (
+                    " AND created_at <= %s"
+                    " AND (created_at < %s OR (created_at = %s AND id < %s))"
+                )
+                params.extend([after_created_at, after_created_at, after_created_at, after_id])
+                query += " ORDER BY created_at DESC, id DESC LIMIT %s"
+                params.append(limit)
+            else:
+                query += " ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s"
+                params.extend([limit, offset])
 
-            result = self.execute_query(query, (user_id, limit, offset))
-            return result if result else []
+            result = self.execute_query(query, params)
+            return _paginate(result, limit)
 
         except Exception as error:
             print(f"Error al obtener reportes de usuario: {error}")
-            return []
+            return _paginate(None, limit)
         finally:
             self.disconnect()
 
@@ -249,7 +471,9 @@ class ReportModel(BaseModel):
         search_term: str,
         report_type: Optional[str] = None,
         tags: Optional[List[str]] = None,
-        limit: int = 50
+        limit: int = 50,
+        fields: Optional[List[str]] = None,
+        with_username: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Busca reportes por término de búsqueda
@@ -258,20 +482,23 @@ class ReportModel(BaseModel):
             report_type: Filtrar por tipo de reporte
             tags: Filtrar por etiquetas
             limit: Número máximo de resultados
+            fields: Columnas a devolver (por defecto las de resumen)
+            with_username: Si incluir created_by_username (añade JOIN con users)
         Returns:
             Lista de reportes que coinciden con la búsqueda
         """
         try:
             self.connect()
 
-            query = """
-                SELECT r.*, u.username as created_by_username
-                FROM reports r
-                LEFT JOIN users u ON r.user_id = u.id
-                WHERE (r.title LIKE %s OR r.summary LIKE %s)
+            query = _report_select(fields, with_username) + """
+                WHERE 1=1
             """
-            search_pattern = f"%{search_term}%"
-            params = [search_pattern, search_pattern]
+            params = []
+
+            if search_term:
+                # Búsqueda sobre el índice FULLTEXT de título y resumen
+                query += " AND MATCH(r.title, r.summary) AGAINST(%s IN NATURAL LANGUAGE MODE)"
+                params.append(search_term)
 
             if report_type:
                 query += " AND r.report_type = %s"
@@ -279,28 +506,19 @@ class ReportModel(BaseModel):
 
             if tags:
                 # Buscar reportes que contengan alguna de las etiquetas
-                tag_conditions = []
-                for tag in tags:
-                    tag_conditions.append("JSON_CONTAINS(r.tags, %s)")
-                    params.append(json.dumps(tag))
-
-                query += f" AND ({' OR '.join(tag_conditions)})"
+                query += " AND JSON_OVERLAPS(r.tags, %s)"
+                params.append(orjson.dumps(list(tags)).decode())
 
             query += " ORDER BY r.created_at DESC LIMIT %s"
             params.append(limit)
 
             result = self.execute_query(query, params)
 
-            # Procesar tags JSON
-            if result:
-                for report in result:
-                    if report['tags']:
-                        try:
-                            report['tags'] = json.loads(report['tags'])
-                        except json.JSONDecodeError:
-                            report['tags'] = []
+            if not result:
+                return []
 
-            return result if result else []
+            # Tags JSON decodificados con orjson
+            return _hydrate_tags(result)
 
         except Exception as error:
             print(f"Error al buscar reportes: {error}")
@@ -311,57 +529,86 @@ class ReportModel(BaseModel):
     def get_report_statistics(self) -> Dict[str, Any]:
         """
         Obtiene estadísticas de reportes
+        El resultado se reutiliza durante 60 segundos entre todas las instancias
+        Returns:
+            Diccionario con estadísticas
+        """
+        with _stats_cache_lock:
+            cached_stats = _stats_cache.get('reports')
+        if cached_stats is not None:
+            return copy.deepcopy(cached_stats)
+
+        with _stats_lock:
+            # Otro hilo pudo calcularlas mientras se esperaba el bloqueo
+            with _stats_cache_lock:
+                cached_stats = _stats_cache.get('reports')
+            if cached_stats is None:
+                cached_stats = self._query_report_statistics()
+                if not cached_stats:
+                    return {}
+                with _stats_cache_lock:
+                    _stats_cache['reports'] = cached_stats
+
+        return copy.deepcopy(cached_stats)
+
+    def _query_report_statistics(self) -> Dict[str, Any]:
+        """
+        Calcula las estadísticas de reportes en la base de datos
         Returns:
             Diccionario con estadísticas
         """
         try:
             self.connect()
 
-            # Estadísticas básicas
-            basic_stats_query = """
+            # Los totales salen de la tabla resumen reports_stats_daily (una fila
+            # por día, tipo y origen, mantenida por triggers) y los usuarios
+            # distintos de reports_stats_users (una fila por usuario). Los desgloses por
+            # tipo y por día llegan ya como objetos JSON en la misma fila
+            stats_query = """
                 SELECT
-                    COUNT(*) as total_reports,
-                    SUM(file_size) as total_size_bytes,
-                    AVG(file_size) as avg_size_bytes,
-                    COUNT(DISTINCT user_id) as unique_users,
-                    SUM(CASE WHEN is_auto_generated = 1 THEN 1 ELSE 0 END) as auto_generated,
-                    SUM(CASE WHEN is_auto_generated = 0 THEN 1 ELSE 0 END) as manual_generated
-                FROM reports
+                    SUM(report_count) as total_reports,
+                    SUM(total_bytes) as total_size_bytes,
+                    SUM(total_bytes) / NULLIF(SUM(sized_count), 0) as avg_size_bytes,
+                    (SELECT COUNT(*) FROM reports_stats_users WHERE report_count > 0) as unique_users,
+                    SUM(CASE WHEN is_auto_generated = 1 THEN report_count ELSE 0 END) as auto_generated,
+                    SUM(CASE WHEN is_auto_generated = 0 THEN report_count ELSE 0 END) as manual_generated,
+                    (
+                        SELECT JSON_OBJECTAGG(report_type, JSON_OBJECT('count', type_count, 'total_size', type_size))
+                        FROM (
+                            SELECT report_type, SUM(report_count) as type_count, SUM(total_bytes) as type_size
+                            FROM reports_stats_daily
+                            GROUP BY report_type
+                            HAVING type_count > 0
+                        ) by_type
+                    ) as by_type,
+                    (
+                        SELECT JSON_OBJECTAGG(CAST(stat_date AS CHAR), day_count)
+                        FROM (
+                            SELECT stat_date, SUM(report_count) as day_count
+                            FROM reports_stats_daily
+                            WHERE stat_date >= DATE(DATE_SUB(NOW(), INTERVAL 7 DAY))
+                            GROUP BY stat_date
+                            HAVING day_count > 0
+                        ) daily
+                    ) as daily_counts
+                FROM reports_stats_daily
             """
 
-            result = self.execute_query(basic_stats_query)
-            stats = result[0] if result else {}
-
-            # Estadísticas por tipo
-            type_stats_query = """
-                SELECT report_type, COUNT(*) as count, SUM(file_size) as total_size
-                FROM reports
-                GROUP BY report_type
-                ORDER BY count DESC
-            """
-
-            type_result = self.execute_query(type_stats_query)
-            stats['by_type'] = {
-                row['report_type']: {
-                    'count': row['count'],
-                    'total_size': row['total_size']
-                }
-                for row in (type_result if type_result else [])
-            }
-
-            # Estadísticas diarias (últimos 7 días)
-            daily_stats_query = """
-                SELECT DATE(created_at) as date, COUNT(*) as count
-                FROM reports
-                WHERE created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-                GROUP BY DATE(created_at)
-                ORDER BY date DESC
-            """
-
-            daily_result = self.execute_query(daily_stats_query)
-            stats['daily_counts'] = {
-                str(row['date']): row['count']
-                for row in (daily_result if daily_result else [])
+            result = self.execute_query(stats_query)
+            if not result:
+                return {}
+
+            row = result[0]
+            stats = {
+                'total_reports': int(row['total_reports'] or 0),
+                'total_size_bytes': row['total_size_bytes'],
+                'avg_size_bytes': row['avg_size_bytes'],
+                'unique_users': row['unique_users'],
+                'auto_generated': int(row['auto_generated'] or 0),
+                'manual_generated': int(row['manual_generated'] or 0),
+                # Estadísticas por tipo y diarias (últimos 7 días)
+                'by_type': orjson.loads(row['by_type']) if row['by_type'] else {},
+                'daily_counts': orjson.loads(row['daily_counts']) if row['daily_counts'] else {}
             }
 
             return stats
@@ -405,7 +652,7 @@ class ReportModel(BaseModel):
 
             if tags is not None:
                 updates.append("tags = %s")
-                params.append(json.dumps(tags))
+                params.append(orjson.dumps(tags).decode())
 
             if not updates:
                 return True  # No hay nada que actualizar
@@ -438,29 +685,44 @@ class ReportModel(BaseModel):
             True si la eliminación fue exitosa
         """
         try:
-            # Obtener información del reporte antes de eliminar
-            report = self.get_report_by_id(report_id)
-            if not report:
-                return False
-
             self.connect()
 
-            # Eliminar registro de la base de datos
-            query = "DELETE FROM reports WHERE id = %s"
-
-            cursor = self.connection.cursor()
-            cursor.execute(query, (report_id,))
-            self.connection.commit()
-
-            affected_rows = cursor.rowcount
-            cursor.close()
-
-            # Eliminar archivo físico si se solicita
-            if delete_file and affected_rows > 0:
+            if not delete_file:
+                # Sin archivo que borrar basta una sola sentencia (autocommit)
+                cursor = self.connection.cursor()
                 try:
-                    if os.path.exists(report['file_path']):
-                        os.remove(report['file_path'])
-                        print(f"Archivo eliminado: {report['file_path']}")
+                    cursor.execute("DELETE FROM reports WHERE id = %s", (report_id,))
+                    return cursor.rowcount > 0
+                finally:
+                    cursor.close()
+
+            # Leer la ruta y eliminar el registro en una misma transacción
+            self.connection.start_transaction()
+            cursor = self.connection.cursor(dictionary=True)
+            try:
+                cursor.execute("SELECT file_path FROM reports WHERE id = %s FOR UPDATE", (report_id,))
+                path_result = cursor.fetchone()
+                if not path_result:
+                    self.connection.rollback()
+                    return False
+
+                cursor.execute("DELETE FROM reports WHERE id = %s", (report_id,))
+                affected_rows = cursor.rowcount
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
+            # Eliminar el archivo físico
+            file_path = path_result['file_path']
+            if affected_rows > 0:
+                try:
+                    os.remove(file_path)
+                    print(f"Archivo eliminado: {file_path}")
+                except FileNotFoundError:
+                    pass
                 except OSError as e:
                     print(f"Error al eliminar archivo: {e}")
 
@@ -490,10 +752,15 @@ class ReportModel(BaseModel):
 
             cutoff_date = datetime.now() - timedelta(days=days_to_keep)
 
-            # Obtener reportes a eliminar si necesitamos borrar archivos
+            # Eliminar archivos físicos antes que los registros: las rutas se leen
+            # con un cursor sin buffer en bloques, de modo que la memoria no
+            # depende del número de reportes, y se borran en paralelo
+            # (os.remove libera el GIL)
             if delete_files:
-                reports_query = "SELECT file_path FROM reports WHERE created_at < %s"
-                reports_to_delete = self.execute_query(reports_query, (cutoff_date,))
+                self._remove_report_files(
+                    "SELECT file_path FROM reports WHERE created_at < %s",
+                    (cutoff_date,)
+                )
 
             # Eliminar registros de la base de datos
             delete_query = "DELETE FROM reports WHERE created_at < %s"
@@ -505,15 +772,6 @@ class ReportModel(BaseModel):
             deleted_count = cursor.rowcount
             cursor.close()
 
-            # Eliminar archivos físicos
-            if delete_files and reports_to_delete:
-                for report in reports_to_delete:
-                    try:
-                        if os.path.exists(report['file_path']):
-                            os.remove(report['file_path'])
-                    except OSError:
-                        continue
-
             if deleted_count > 0:
                 print(f"Eliminados {deleted_count} reportes anteriores a {cutoff_date}")
 
@@ -523,4 +781,35 @@ class ReportModel(BaseModel):
             print(f"Error al limpiar reportes antiguos: {error}")
             return 0
         finally:
-            self.disconnect()
\ No newline at end of file
+            self.disconnect()
+
+    def _remove_report_files(self, query: str, params: tuple, chunk_size: int = 5000):
+        """
+        Elimina los archivos cuyas rutas devuelve una consulta
+        Mientras se borra un bloque de archivos se lee el siguiente
+        Args:
+            query: Consulta que devuelve la columna file_path
+            params: Parámetros de la consulta
+            chunk_size: Filas leídas por cada llamada a fetchmany
+        """
+        cursor = self.connection.cursor(buffered=False)
+        try:
+            cursor.execute(query, params)
+
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                pending = None
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+
+                    removal = executor.map(_remove_file, [row[0] for row in rows])
+                    # Como máximo dos bloques en curso
+                    if pending is not None:
+                        list(pending)
+                    pending = removal
+
+                if pending is not None:
+                    list(pending)
+        finally:
+            cursor.close()
@@ -1,11 +1,71 @@
 # Modelo de sesiones
 # Gestiona las sesiones activas de usuarios en el sistema
 
-import uuid
+import time
+import secrets
+import threading
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any
+from cachetools import TTLCache
 from .base_model import BaseModel
 
+# Caché del conteo de sesiones activas (60 segundos)
+_stats_cache = TTLCache(maxsize=4, ttl=60)
+_stats_cache_lock = threading.Lock()
+# Serializa el cálculo para que una caché vacía no dispare consultas simultáneas
+_stats_lock = threading.Lock()
+
+# Vigencia de los tokens de sesión firmados (24 horas)
+SESSION_TOKEN_TTL = 24 * 60 * 60
+
+# Revocaciones vigentes mientras puedan existir tokens sin vencer:
+# sesiones cerradas {session_id: True} y usuarios {user_id: (momento, sesión_excluida)}
+_revoked_sessions = TTLCache(maxsize=100000, ttl=SESSION_TOKEN_TTL)
+_revoked_users = TTLCache(maxsize=10000, ttl=SESSION_TOKEN_TTL)
+_revoked_lock = threading.Lock()
+
+
+def revoke_session_token(session_id: str):
+    """
+    Invalida los tokens firmados emitidos para una sesión
+    Args:
+        session_id: ID de la sesión
+    """
+    with _revoked_lock:
+        _revoked_sessions[session_id] = True
+
+
+def revoke_user_tokens(user_id: int, except_session: Optional[str] = None):
+    """
+    Invalida los tokens emitidos hasta ahora para un usuario
+    Args:
+        user_id: ID del usuario
+        except_session: ID de sesión cuyos tokens siguen siendo válidos
+    """
+    with _revoked_lock:
+        _revoked_users[user_id] = (int(time.time()), except_session)
+
+
+def is_token_revoked(claims: Dict[str, Any]) -> bool:
+    """
+    Indica si el contenido de un token corresponde a una sesión o usuario revocado
+    Args:
+        claims: Contenido del token (sid, uid, iat)
+    Returns:
+        True si el token ya no debe aceptarse
+    """
+    with _revoked_lock:
+        if claims['sid'] in _revoked_sessions:
+            return True
+        user_revocation = _revoked_users.get(claims['uid'])
+
+    if user_revocation:
+        revoked_at, except_session = user_revocation
+        if claims['iat'] <= revoked_at and claims['sid'] != except_session:
+            return True
+
+    return False
+
 
 class SessionModel(BaseModel):
     """
@@ -13,6 +73,14 @@ class SessionModel(BaseModel):
     Maneja creación, validación y limpieza de sesiones
     """
 
+    # Caché compartida de sesiones válidas: {session_id: (sesión, expires_at)}
+    _session_cache = TTLCache(maxsize=10000, ttl=30)
+    _session_cache_lock = threading.Lock()
+
+    # Sesiones cuya última actividad se escribió hace menos de 60 segundos
+    _last_activity_flush = TTLCache(maxsize=10000, ttl=60)
+    _last_activity_lock = threading.Lock()
+
     def __init__(self):
         super().__init__()
         self.table_name = "sessions"
@@ -22,9 +90,9 @@ class SessionModel(BaseModel):
         """
         Genera un ID único para la sesión
         Returns:
-            UUID único como string
+            Token aleatorio URL-safe de 24 caracteres ASCII
         """
-        return str(uuid.uuid4())
+        return secrets.token_urlsafe(18)
 
     def create_session(
         self,
@@ -77,34 +145,38 @@ class SessionModel(BaseModel):
         Returns:
             Datos de la sesión o None si no existe/expiró
         """
+        with self._session_cache_lock:
+            cached = self._session_cache.get(session_id)
+        if cached is not None:
+            session, expires_at = cached
+            if expires_at > datetime.now():
+                return dict(session)
+
         try:
             self.connect()
 
+            # La expiración y el estado del usuario se verifican en la propia
+            # consulta; las sesiones vencidas las marca cleanup_expired_sessions
             query = """
-                SELECT s.*, u.username, u.is_active as user_is_active
+                SELECT s.*, u.username, u.is_active as user_is_active, u.is_admin
                 FROM sessions s
-                LEFT JOIN users u ON s.user_id = u.id
-                WHERE s.id = %s AND s.is_active = TRUE
+                JOIN users u ON s.user_id = u.id
+                WHERE s.id = %s
+                AND s.is_active = TRUE
+                AND s.expires_at > NOW()
+                AND u.is_active = TRUE
             """
 
-            result = self.execute_query(query, (session_id,))
+            result = self.execute_prepared_query(query, (session_id,))
 
             if not result:
                 return None
 
             session = result[0]
+            with self._session_cache_lock:
+                self._session_cache[session_id] = (session, session['expires_at'])
 
-            # Verificar si la sesión ha expirado
-            if session['expires_at'] and session['expires_at'] < datetime.now():
-                self.expire_session(session_id)
-                return None
-
-            # Verificar si el usuario está activo
-            if not session['user_is_active']:
-                self.expire_session(session_id)
-                return None
-
-            return session
+            return dict(session)
 
         except Exception as error:
             print(f"Error al obtener sesión: {error}")
@@ -126,11 +198,17 @@ class SessionModel(BaseModel):
     def update_session_activity(self, session_id: str) -> bool:
         """
         Actualiza la última actividad de una sesión
+        Las escrituras se agrupan: como máximo una por sesión cada 60 segundos
+        (last_activity es informativo; la expiración depende de expires_at)
         Args:
             session_id: ID de la sesión
         Returns:
             True si la actualización fue exitosa
         """
+        with self._last_activity_lock:
+            if session_id in self._last_activity_flush:
+                return True
+
         try:
             self.connect()
 
@@ -140,12 +218,15 @@ class SessionModel(BaseModel):
                 WHERE id = %s AND is_active = TRUE
             """
 
-            cursor = self.connection.cursor()
+            # Cursor preparado reutilizable; la conexión usa autocommit
+            cursor = self.get_prepared_cursor(query)
             cursor.execute(query, (session_id,))
-            self.connection.commit()
 
             affected_rows = cursor.rowcount
-            cursor.close()
+
+            if affected_rows > 0:
+                with self._last_activity_lock:
+                    self._last_activity_flush[session_id] = True
 
             return affected_rows > 0
 
@@ -155,6 +236,19 @@ class SessionModel(BaseModel):
         finally:
             self.disconnect()
 
+    @classmethod
+    def invalidate_cached_session(cls, session_id: Optional[str] = None):
+        """
+        Elimina sesiones de la caché en memoria
+        Args:
+            session_id: ID de la sesión (si es None se vacía toda la caché)
+        """
+        with cls._session_cache_lock:
+            if session_id is None:
+                cls._session_cache.clear()
+            else:
+                cls._session_cache.pop(session_id, None)
+
     def extend_session(
         self,
         session_id: str,
@@ -168,6 +262,8 @@ class SessionModel(BaseModel):
         Returns:
             True si la extensión fue exitosa
         """
+        self.invalidate_cached_session(session_id)
+
         try:
             self.connect()
 
@@ -180,12 +276,11 @@ class SessionModel(BaseModel):
                 WHERE id = %s AND is_active = TRUE
             """
 
-            cursor = self.connection.cursor()
+            # Cursor preparado reutilizable; la conexión usa autocommit
+            cursor = self.get_prepared_cursor(query)
             cursor.execute(query, (new_expires_at, session_id))
-            self.connection.commit()
 
             affected_rows = cursor.rowcount
-            cursor.close()
 
             return affected_rows > 0
 
@@ -203,6 +298,8 @@ class SessionModel(BaseModel):
         Returns:
             True si la expiración fue exitosa
         """
+        self.invalidate_cached_session(session_id)
+
         try:
             self.connect()
 
@@ -212,12 +309,11 @@ class SessionModel(BaseModel):
                 WHERE id = %s
             """
 
-            cursor = self.connection.cursor()
+            # Cursor preparado reutilizable; la conexión usa autocommit
+            cursor = self.get_prepared_cursor(query)
             cursor.execute(query, (session_id,))
-            self.connection.commit()
 
             affected_rows = cursor.rowcount
-            cursor.close()
 
             print(f"Sesión expirada: {session_id}")
             return affected_rows > 0
@@ -237,6 +333,9 @@ class SessionModel(BaseModel):
         Returns:
             Número de sesiones expiradas
         """
+        # La caché no está indexada por usuario: se vacía por completo
+        self.invalidate_cached_session()
+
         try:
             self.connect()
 
@@ -345,12 +444,38 @@ class SessionModel(BaseModel):
     def get_active_sessions_count(self) -> int:
         """
         Obtiene el número de sesiones activas
+        El resultado se reutiliza durante 60 segundos entre todas las instancias
         Returns:
             Número de sesiones activas
         """
+        with _stats_cache_lock:
+            count = _stats_cache.get('active_sessions')
+        if count is not None:
+            return count
+
+        with _stats_lock:
+            # Otro hilo pudo calcularlo mientras se esperaba el bloqueo
+            with _stats_cache_lock:
+                count = _stats_cache.get('active_sessions')
+            if count is None:
+                count = self._query_active_sessions_count()
+                if count is None:
+                    return 0
+                with _stats_cache_lock:
+                    _stats_cache['active_sessions'] = count
+
+        return count
+
+    def _query_active_sessions_count(self) -> Optional[int]:
+        """
+        Cuenta las sesiones activas en la base de datos
+        Returns:
+            Número de sesiones activas o None si hay error
+        """
         try:
             self.connect()
 
+            # Se resuelve como rango sobre el índice idx_active_expires
             query = """
                 SELECT COUNT(*) as count
                 FROM sessions
@@ -358,11 +483,11 @@ class SessionModel(BaseModel):
             """
 
             result = self.execute_query(query)
-            return result[0]['count'] if result else 0
+            return result[0]['count'] if result else None
 
         except Exception as error:
             print(f"Error al contar sesiones activas: {error}")
-            return 0
+            return None
         finally:
             self.disconnect()
 
@@ -375,21 +500,22 @@ class SessionModel(BaseModel):
         try:
             self.connect()
 
-            # Consultas múltiples para obtener estadísticas
-            queries = {
-                'total_sessions': "SELECT COUNT(*) as count FROM sessions",
-                'active_sessions': "SELECT COUNT(*) as count FROM sessions WHERE is_active = TRUE AND expires_at > NOW()",
-                'expired_sessions': "SELECT COUNT(*) as count FROM sessions WHERE is_active = FALSE OR expires_at <= NOW()",
-                'sessions_today': "SELECT COUNT(*) as count FROM sessions WHERE DATE(created_at) = CURDATE()",
-                'unique_users_today': "SELECT COUNT(DISTINCT user_id) as count FROM sessions WHERE DATE(created_at) = CURDATE()"
-            }
-
-            stats = {}
-            for key, query in queries.items():
-                result = self.execute_query(query)
-                stats[key] = result[0]['count'] if result else 0
-
-            return stats
+            # Todas las estadísticas en una sola pasada con agregados condicionales
+            query = """
+                SELECT
+                    COUNT(*) as total_sessions,
+                    SUM(CASE WHEN is_active = TRUE AND expires_at > NOW() THEN 1 ELSE 0 END) as active_sessions,
+                    SUM(CASE WHEN is_active = FALSE OR expires_at <= NOW() THEN 1 ELSE 0 END) as expired_sessions,
+                    SUM(CASE WHEN DATE(created_at) = CURDATE() THEN 1 ELSE 0 END) as sessions_today,
+                    COUNT(DISTINCT CASE WHEN DATE(created_at) = CURDATE() THEN user_id END) as unique_users_today
+                FROM sessions
+            """
+
+            result = self.execute_query(query)
+            if not result:
+                return {}
+
+            return {key: int(value or 0) for key, value in result[0].items()}
 
         except Exception as error:
             print(f"Error al obtener estadísticas de sesiones: {error}")
@@ -1,10 +1,114 @@
 # Modelo de usuarios
 # Gestiona la autenticación y datos de usuarios del sistema
 
+import os
+import functools
+import threading
 import bcrypt
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any
+from cachetools import TTLCache
 from .base_model import BaseModel
+from .session_model import SessionModel, revoke_user_tokens
+
+# Hilos para verificar contraseñas en paralelo (se crea en el primer uso)
+_BCRYPT_POOL = None
+_BCRYPT_POOL_LOCK = threading.Lock()
+
+
+def _get_bcrypt_pool() -> ThreadPoolExecutor:
+    """
+    Obtiene el pool de hilos de bcrypt, creándolo si no existe
+    bcrypt libera el GIL durante el hash, así que los hilos verifican en
+    paralelo sin lanzar procesos que reimporten la aplicación (logger,
+    sumidero io_uring, pool de conexiones)
+    Returns:
+        Pool con un hilo por núcleo
+    """
+    global _BCRYPT_POOL
+    if _BCRYPT_POOL is None:
+        with _BCRYPT_POOL_LOCK:
+            if _BCRYPT_POOL is None:
+                _BCRYPT_POOL = ThreadPoolExecutor(
+                    max_workers=os.cpu_count(),
+                    thread_name_prefix='bcrypt'
+                )
+    return _BCRYPT_POOL
+
+
+# Cachés de usuarios por ID y por nombre de usuario (120 segundos)
+_user_cache_by_id = TTLCache(maxsize=4096, ttl=120)
+_user_cache_by_username = TTLCache(maxsize=4096, ttl=120)
+# Índice inverso {user_id: nombres usados como clave} para invalidar en O(1)
+_username_keys_by_id = TTLCache(maxsize=4096, ttl=120)
+_user_cache_lock = threading.Lock()
+
+# Columnas públicas de un usuario: nunca se cachea ni se devuelve password_hash
+_PUBLIC_USER_COLS = (
+    "id, username, email, full_name, is_active, is_admin, "
+    "last_login, created_at, updated_at"
+)
+
+# Sentencias UPDATE de update_user precalculadas para cada combinación de campos
+# (bit 0: email, bit 1: full_name, bit 2: is_active)
+_UPDATE_FIELDS = ('email', 'full_name', 'is_active')
+_UPDATE_SQL = {
+    mask: "UPDATE users SET {}, updated_at = NOW() WHERE id = %s".format(
+        ', '.join(f"{field} = %s" for bit, field in enumerate(_UPDATE_FIELDS) if mask & (1 << bit))
+    )
+    for mask in range(1, 1 << len(_UPDATE_FIELDS))
+}
+
+# Columnas públicas más el hash: el login devuelve el usuario sin volver a leerlo
+_AUTH_QUERY = f"SELECT {_PUBLIC_USER_COLS}, password_hash FROM users WHERE username = %s"
+
+# Último login al autenticar; el pool usa autocommit, no hace falta un COMMIT aparte
+_LAST_LOGIN_SQL = "UPDATE users SET last_login = %s WHERE id = %s"
+
+
+def _cached_user(cache, index_by_id: bool = False):
+    """
+    Decorador que consulta la caché indicada antes de leer el usuario de la base de datos
+    Args:
+        cache: Caché donde se guardan los usuarios según el argumento del método
+        index_by_id: Registrar la clave en el índice inverso por ID (cachés
+                     cuya clave no es el ID del usuario)
+    Returns:
+        Decorador para métodos de UserModel con un único argumento clave
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, key):
+            with _user_cache_lock:
+                user = cache.get(key)
+            if user is None:
+                user = method(self, key)
+                if user is None:
+                    return None
+                with _user_cache_lock:
+                    cache[key] = user
+                    if index_by_id:
+                        # Se reasigna para que el índice no venza antes que la entrada
+                        keys = _username_keys_by_id.get(user['id'], set())
+                        keys.add(key)
+                        _username_keys_by_id[user['id']] = keys
+            # Copia para que el llamador no modifique la entrada cacheada
+            return dict(user)
+        return wrapper
+    return decorator
+
+
+def invalidate_cached_user(user_id: int):
+    """
+    Elimina un usuario de las cachés en memoria
+    Args:
+        user_id: ID del usuario
+    """
+    with _user_cache_lock:
+        _user_cache_by_id.pop(user_id, None)
+        for name in _username_keys_by_id.pop(user_id, ()):
+            _user_cache_by_username.pop(name, None)
 
 
 class UserModel(BaseModel):
@@ -16,6 +120,9 @@ class UserModel(BaseModel):
     def __init__(self):
         super().__init__()
         self.table_name = "users"
+        # Factor de coste de bcrypt: cada unidad duplica el tiempo de hash.
+        # Subirlo con el tiempo mantiene la resistencia ante hardware más rápido
+        self._bcrypt_rounds = int(os.getenv('BCRYPT_ROUNDS', '10'))
 
     def hash_password(self, password: str) -> str:
         """
@@ -25,7 +132,7 @@ class UserModel(BaseModel):
         Returns:
             Hash de la contraseña
         """
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self._bcrypt_rounds)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
 
@@ -38,7 +145,21 @@ class UserModel(BaseModel):
         Returns:
             True si la contraseña es correcta
         """
-        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+        return self.verify_password_async(password, hashed).result()
+
+    def verify_password_async(self, password: str, hashed: str) -> Future:
+        """
+        Verifica una contraseña en el pool de hilos sin bloquear al llamador
+        Las ráfagas de logins se reparten entre todos los núcleos
+        Args:
+            password: Contraseña en texto plano
+            hashed: Hash almacenado
+        Returns:
+            Future cuyo resultado es True si la contraseña es correcta
+        """
+        return _get_bcrypt_pool().submit(
+            bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8')
+        )
 
     def create_user(
         self,
@@ -60,35 +181,33 @@ class UserModel(BaseModel):
             ID del usuario creado o None si hay error
         """
         try:
-            self.connect()
-
             # Verificar si el usuario ya existe
             if self.get_user_by_username(username):
                 print(f"Error: El usuario '{username}' ya existe")
                 return None
 
+            # El hash se calcula sin retener una conexión del pool
             password_hash = self.hash_password(password)
 
-            query = """
-                INSERT INTO users (username, password_hash, email, full_name, is_admin)
-                VALUES (%s, %s, %s, %s, %s)
-            """
+            with self:
+                query = """
+                    INSERT INTO users (username, password_hash, email, full_name, is_admin)
+                    VALUES (%s, %s, %s, %s, %s)
+                """
 
-            cursor = self.connection.cursor()
-            cursor.execute(query, (username, password_hash, email, full_name, is_admin))
-            self.connection.commit()
+                cursor = self.connection.cursor()
+                cursor.execute(query, (username, password_hash, email, full_name, is_admin))
+                self.connection.commit()
 
-            user_id = cursor.lastrowid
-            cursor.close()
+                user_id = cursor.lastrowid
+                cursor.close()
 
-            print(f"Usuario '{username}' creado exitosamente con ID: {user_id}")
-            return user_id
+                print(f"Usuario '{username}' creado exitosamente con ID: {user_id}")
+                return user_id
 
         except Exception as error:
             print(f"Error al crear usuario: {error}")
             return None
-        finally:
-            self.disconnect()
 
     def authenticate_user(self, username: str, password: str) -> Optional[Dict[str, Any]]:
         """
@@ -97,12 +216,12 @@ class UserModel(BaseModel):
             username: Nombre de usuario
             password: Contraseña en texto plano
         Returns:
-            Datos del usuario si la autenticación es exitosa
+            Datos públicos del usuario (sin password_hash) si la autenticación es exitosa
         """
         try:
-            self.connect()
-
-            user = self.get_user_by_username(username)
+            # La conexión se devuelve al pool antes de verificar la contraseña:
+            # bcrypt tarda decenas de milisegundos y no necesita la base de datos
+            user = self._get_user_auth_cols(username)
             if not user:
                 return None
 
@@ -110,69 +229,82 @@ class UserModel(BaseModel):
                 print(f"Usuario '{username}' está inactivo")
                 return None
 
-            if self.verify_password(password, user['password_hash']):
-                # Actualizar último login
-                self.update_last_login(user['id'])
-
-                # Remover la contraseña del resultado
-                user.pop('password_hash', None)
-                return user
-            else:
+            if not self.verify_password(password, user['password_hash']):
                 print(f"Contraseña incorrecta para el usuario '{username}'")
                 return None
 
+            # Actualizar último login con una sola sentencia preparada
+            last_login = datetime.now().replace(microsecond=0)
+            with self:
+                cursor = self.get_prepared_cursor(_LAST_LOGIN_SQL)
+                cursor.execute(_LAST_LOGIN_SQL, (last_login, user['id']))
+            invalidate_cached_user(user['id'])
+
+            # El resultado se arma con la fila ya leída, sin la contraseña
+            user.pop('password_hash', None)
+            user['last_login'] = last_login
+            return user
+
         except Exception as error:
             print(f"Error en autenticación: {error}")
             return None
-        finally:
-            self.disconnect()
 
+    def _get_user_auth_cols(self, username: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene las columnas públicas y el hash de contraseña de un usuario
+        Args:
+            username: Nombre de usuario
+        Returns:
+            Datos públicos del usuario con password_hash, o None si no existe
+        """
+        try:
+            with self:
+                result = self.execute_query(_AUTH_QUERY, (username,))
+                return result[0] if result else None
+
+        except Exception as error:
+            print(f"Error al obtener credenciales de usuario: {error}")
+            return None
+
+    @_cached_user(_user_cache_by_username, index_by_id=True)
     def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
         """
         Obtiene un usuario por su nombre de usuario
         Args:
             username: Nombre de usuario
         Returns:
-            Datos del usuario o None si no existe
+            Datos públicos del usuario (sin password_hash) o None si no existe
         """
         try:
-            if not self.connection:
-                self.connect()
+            with self:
+                query = f"SELECT {_PUBLIC_USER_COLS} FROM users WHERE username = %s"
+                result = self.execute_query(query, (username,))
 
-            query = "SELECT * FROM users WHERE username = %s"
-            result = self.execute_query(query, (username,))
-
-            return result[0] if result else None
+                return result[0] if result else None
 
         except Exception as error:
             print(f"Error al obtener usuario: {error}")
             return None
 
+    @_cached_user(_user_cache_by_id)
     def get_user_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
         """
         Obtiene un usuario por su ID
         Args:
             user_id: ID del usuario
         Returns:
-            Datos del usuario o None si no existe
+            Datos públicos del usuario (sin password_hash) o None si no existe
         """
         try:
-            self.connect()
-
-            query = "SELECT * FROM users WHERE id = %s"
-            result = self.execute_query(query, (user_id,))
+            with self:
+                query = f"SELECT {_PUBLIC_USER_COLS} FROM users WHERE id = %s"
+                result = self.execute_query(query, (user_id,))
 
-            if result:
-                user = result[0]
-                user.pop('password_hash', None)  # No devolver el hash
-                return user
-            return None
+                return result[0] if result else None
 
         except Exception as error:
             print(f"Error al obtener usuario por ID: {error}")
             return None
-        finally:
-            self.disconnect()
 
     def update_user(
         self,
@@ -191,46 +323,36 @@ class UserModel(BaseModel):
         Returns:
             True si la actualización fue exitosa
         """
-        try:
-            self.connect()
-
-            updates = []
-            params = []
-
-            if email is not None:
-                updates.append("email = %s")
-                params.append(email)
-
-            if full_name is not None:
-                updates.append("full_name = %s")
-                params.append(full_name)
-
-            if is_active is not None:
-                updates.append("is_active = %s")
-                params.append(is_active)
+        mask = (
+            (email is not None)
+            | ((full_name is not None) << 1)
+            | ((is_active is not None) << 2)
+        )
 
-            if not updates:
-                return True  # No hay nada que actualizar
+        if not mask:
+            return True  # No hay nada que actualizar
 
-            updates.append("updated_at = NOW()")
-            params.append(user_id)
+        params = [value for value in (email, full_name, is_active) if value is not None]
+        params.append(user_id)
 
-            query = f"UPDATE users SET {', '.join(updates)} WHERE id = %s"
-
-            cursor = self.connection.cursor()
-            cursor.execute(query, params)
-            self.connection.commit()
-
-            affected_rows = cursor.rowcount
-            cursor.close()
-
-            return affected_rows > 0
+        try:
+            with self:
+                # Sentencia fija por combinación: se reutiliza el cursor preparado
+                query = _UPDATE_SQL[mask]
+                cursor = self.get_prepared_cursor(query)
+                cursor.execute(query, params)
+                invalidate_cached_user(user_id)
+                if is_active is not None:
+                    # Las sesiones en caché y los tokens firmados incluyen el
+                    # estado y el rol del usuario
+                    SessionModel.invalidate_cached_session()
+                    revoke_user_tokens(user_id)
+
+                return cursor.rowcount > 0
 
         except Exception as error:
             print(f"Error al actualizar usuario: {error}")
             return False
-        finally:
-            self.disconnect()
 
     def update_password(self, user_id: int, new_password: str) -> bool:
         """
@@ -242,26 +364,25 @@ class UserModel(BaseModel):
             True si la actualización fue exitosa
         """
         try:
-            self.connect()
-
+            # El hash se calcula sin retener una conexión del pool
             password_hash = self.hash_password(new_password)
 
-            query = "UPDATE users SET password_hash = %s, updated_at = NOW() WHERE id = %s"
+            with self:
+                query = "UPDATE users SET password_hash = %s, updated_at = NOW() WHERE id = %s"
 
-            cursor = self.connection.cursor()
-            cursor.execute(query, (password_hash, user_id))
-            self.connection.commit()
+                cursor = self.connection.cursor()
+                cursor.execute(query, (password_hash, user_id))
+                self.connection.commit()
+                invalidate_cached_user(user_id)
 
-            affected_rows = cursor.rowcount
-            cursor.close()
+                affected_rows = cursor.rowcount
+                cursor.close()
 
-            return affected_rows > 0
+                return affected_rows > 0
 
         except Exception as error:
             print(f"Error al actualizar contraseña: {error}")
             return False
-        finally:
-            self.disconnect()
 
     def update_last_login(self, user_id: int) -> bool:
         """
@@ -272,48 +393,70 @@ class UserModel(BaseModel):
             True si la actualización fue exitosa
         """
         try:
-            if not self.connection:
-                self.connect()
-
-            query = "UPDATE users SET last_login = NOW() WHERE id = %s"
+            with self:
+                query = "UPDATE users SET last_login = NOW() WHERE id = %s"
 
-            cursor = self.connection.cursor()
-            cursor.execute(query, (user_id,))
-            self.connection.commit()
-            cursor.close()
+                cursor = self.connection.cursor()
+                cursor.execute(query, (user_id,))
+                self.connection.commit()
+                invalidate_cached_user(user_id)
+                cursor.close()
 
-            return True
+                return True
 
         except Exception as error:
             print(f"Error al actualizar último login: {error}")
             return False
 
-    def get_all_users(self, include_inactive: bool = False) -> List[Dict[str, Any]]:
+    def get_all_users(
+        self,
+        page: int = 1,
+        per_page: int = 50,
+        include_inactive: bool = False
+    ) -> Dict[str, Any]:
         """
-        Obtiene todos los usuarios
+        Obtiene una página de usuarios
         Args:
+            page: Número de página (inicia en 1)
+            per_page: Usuarios por página
             include_inactive: Si incluir usuarios inactivos
         Returns:
-            Lista de usuarios
+            Diccionario con los usuarios ('data') y metadatos de paginación ('pagination')
         """
-        try:
-            self.connect()
-
-            query = "SELECT id, username, email, full_name, is_active, is_admin, last_login, created_at FROM users"
+        page = max(page, 1)
+        offset = (page - 1) * per_page
 
-            if not include_inactive:
-                query += " WHERE is_active = TRUE"
+        try:
+            with self:
+                where = "" if include_inactive else " WHERE is_active = TRUE"
 
-            query += " ORDER BY created_at DESC"
+                # Total y página solicitada con la misma conexión
+                count_result = self.execute_query(f"SELECT COUNT(*) as total FROM users{where}")
+                total = count_result[0]['total'] if count_result else 0
 
-            result = self.execute_query(query)
-            return result if result else []
+                query = f"""
+                    SELECT id, username, email, full_name, is_active, is_admin, last_login, created_at
+                    FROM users{where}
+                    ORDER BY created_at DESC
+                    LIMIT %s OFFSET %s
+                """
+                users = self.execute_query(query, (per_page, offset)) or []
 
         except Exception as error:
             print(f"Error al obtener usuarios: {error}")
-            return []
-        finally:
-            self.disconnect()
+            total, users = 0, []
+
+        return {
+            'data': users,
+            'pagination': {
+                'current_page': page,
+                'per_page': per_page,
+                'total_items': total,
+                'total_pages': (total + per_page - 1) // per_page,
+                'has_next': offset + per_page < total,
+                'has_prev': page > 1
+            }
+        }
 
     def deactivate_user(self, user_id: int) -> bool:
         """
@@ -323,7 +466,7 @@ class UserModel(BaseModel):
         Returns:
             True si la desactivación fue exitosa
         """
-        return self.update_user(user_id, is_active=False)
+        return self._set_user_active(user_id, False)
 
     def activate_user(self, user_id: int) -> bool:
         """
@@ -333,7 +476,33 @@ class UserModel(BaseModel):
         Returns:
             True si la activación fue exitosa
         """
-        return self.update_user(user_id, is_active=True)
+        return self._set_user_active(user_id, True)
+
+    def _set_user_active(self, user_id: int, is_active: bool) -> bool:
+        """
+        Cambia el estado activo de un usuario con una única sentencia
+        Args:
+            user_id: ID del usuario
+            is_active: Nuevo estado activo
+        Returns:
+            True si la actualización fue exitosa
+        """
+        try:
+            with self:
+                query = "UPDATE users SET is_active = %s, updated_at = NOW() WHERE id = %s"
+                cursor = self.get_prepared_cursor(query)
+                cursor.execute(query, (is_active, user_id))
+                invalidate_cached_user(user_id)
+                # Las sesiones en caché y los tokens firmados incluyen el
+                # estado y el rol del usuario
+                SessionModel.invalidate_cached_session()
+                revoke_user_tokens(user_id)
+
+                return cursor.rowcount > 0
+
+        except Exception as error:
+            print(f"Error al cambiar estado de usuario: {error}")
+            return False
 
     def create_default_admin(self) -> bool:
         """
@@ -3,58 +3,81 @@
 
 import sys
 import os
+from itertools import islice
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from agents.internal.verificador_agent import AgenteVerificador
-import json
+
+# Severidades que se listan como críticas y máximo de elementos a mostrar
+CRITICAL_SEVERITIES = frozenset(('CRITICAL', 'HIGH'))
+MAX_CRITICAL_SHOWN = 5
 
 def main():
+    # Sin line buffering en TTY: el resumen se vuelca de una vez al final
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=False)
+
     print("Iniciando analisis completo del proyecto LiveChat-IA...")
 
     # Crear instancia del verificador
     verificador = AgenteVerificador()
 
     # Ejecutar análisis completo
-    print("Analizando estructura del proyecto...")
+    print("Analizando estructura del proyecto...", flush=True)
     analysis = verificador.analyze_project_structure()
 
+    # El resumen se acumula y se escribe de una sola vez al final
+    out = []
+
     # Mostrar resumen
-    print("\n" + "="*60)
-    print("RESUMEN DEL ANALISIS")
-    print("="*60)
-
-    print(f"Total de archivos: {analysis['structure']['total_files']}")
-    print(f"Archivos Python: {analysis['metrics']['python_files']}")
-    print(f"Lineas de codigo: {analysis['metrics']['total_lines']}")
-    print(f"Vulnerabilidades: {len(analysis['vulnerabilities'])}")
-    print(f"Mejoras sugeridas: {len(analysis['improvements'])}")
-
-    print("\nARCHIVOS POR TIPO:")
-    for ext, count in analysis['structure']['by_type'].items():
-        print(f"  {ext}: {count}")
-
-    print("\nVULNERABILIDADES CRITICAS:")
-    critical_vulns = [v for v in analysis['vulnerabilities'] if v['severity'] in ['CRITICAL', 'HIGH']]
-    for vuln in critical_vulns[:5]:
-        print(f"  - {vuln['type']}: {vuln['description']}")
-
-    print("\nMEJORAS PRIORITARIAS:")
-    high_priority = [i for i in analysis['improvements'] if i['priority'] == 'HIGH']
-    for improvement in high_priority:
-        print(f"  - {improvement['category']}: {improvement['description']}")
+    out.append("\n" + "="*60)
+    out.append("RESUMEN DEL ANALISIS")
+    out.append("="*60)
+
+    out.append(f"Total de archivos: {analysis['structure']['total_files']}")
+    out.append(f"Archivos Python: {analysis['metrics']['python_files']}")
+    out.append(f"Lineas de codigo: {analysis['metrics']['total_lines']}")
+    out.append(f"Vulnerabilidades: {len(analysis['vulnerabilities'])}")
+    out.append(f"Mejoras sugeridas: {len(analysis['improvements'])}")
+
+    out.append("\nARCHIVOS POR TIPO:")
+    out.extend(f"  {ext}: {count}" for ext, count in analysis['structure']['by_type'].items())
+
+    # Una sola pasada por lista, deteniéndose al reunir las críticas a mostrar
+    out.append("\nVULNERABILIDADES CRITICAS:")
+    out.extend(islice(
+        (
+            f"  - {vuln['type']}: {vuln['description']}"
+            for vuln in analysis['vulnerabilities']
+            if vuln['severity'] in CRITICAL_SEVERITIES
+        ),
+        MAX_CRITICAL_SHOWN
+    ))
+
+    out.append("\nMEJORAS PRIORITARIAS:")
+    out.extend(
+        f"  - {improvement['category']}: {improvement['description']}"
+        for improvement in analysis['improvements']
+        if improvement['priority'] == 'HIGH'
+    )
 
     # Verificar cumplimiento de reglas
-    print("\nCUMPLIMIENTO DE REGLAS CRITICAS:")
+    out.append("\nCUMPLIMIENTO DE REGLAS CRITICAS:")
     compliance = verificador.check_rule_compliance()
-    print(f"  Total reglas: {compliance['total_rules']}")
-    print(f"  Violaciones: {compliance['violations']}")
+    out.append(f"  Total reglas: {compliance['total_rules']}")
+    out.append(f"  Violaciones: {compliance['violations']}")
 
     if compliance['critical_issues']:
-        print("  ISSUES CRITICOS:")
-        for issue in compliance['critical_issues']:
-            print(f"    - {issue['rule']}: {issue['violations']} violaciones")
+        out.append("  ISSUES CRITICOS:")
+        out.extend(
+            f"    - {issue['rule']}: {issue['violations']} violaciones"
+            for issue in compliance['critical_issues']
+        )
+
+    out.append("\nAnalisis completado. Reporte guardado en analysis/")
 
-    print("\nAnalisis completado. Reporte guardado en analysis/")
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
     return analysis
 
 if __name__ == "__main__":
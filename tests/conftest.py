@@ -0,0 +1,7 @@
+# Configuración común de las pruebas
+# Permite importar los paquetes de la aplicación desde la raíz del repositorio
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,103 @@
+# Pruebas del recorrido de historial con cursores sin buffer
+
+from datetime import datetime
+from itertools import islice
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+pytest.importorskip("cachetools")
+pytest.importorskip("dotenv")
+
+from models.history_model import HistoryModel
+
+
+class FakeCursor:
+    """Cursor sin buffer: cerrarlo con filas pendientes es un error en el conector"""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def execute(self, query, params=None):
+        self._connection.unread_result = True
+
+    def __iter__(self):
+        for row in self._connection.rows:
+            yield dict(row)
+        self._connection.unread_result = False
+
+    def close(self):
+        if self._connection.unread_result:
+            self._connection.closed_with_unread = True
+            raise RuntimeError("Unread result found")
+
+
+class FakeConnection:
+    """Conexión del pool con el estado de resultados pendientes"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.unread_result = False
+        self.closed_with_unread = False
+        self.closed = False
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def consume_results(self):
+        self.unread_result = False
+
+    def close(self):
+        self.closed = True
+
+
+def _history_rows(count):
+    return [
+        {'id': i, 'metadata': b'{"n": %d}' % i, 'created_at': datetime(2026, 1, 1)}
+        for i in range(count)
+    ]
+
+
+def _model_with(connection):
+    model = HistoryModel()
+    model.connection = connection
+    return model
+
+
+def test_iter_interactions_by_date_abandoned_releases_connection():
+    connection = FakeConnection(_history_rows(5))
+    model = _model_with(connection)
+
+    rows = model.iter_interactions_by_date(datetime(2026, 1, 1))
+    first = list(islice(rows, 2))
+    rows.close()
+
+    assert [row['metadata'] for row in first] == [{'n': 0}, {'n': 1}]
+    assert not connection.closed_with_unread
+    assert not connection.unread_result
+    assert connection.closed
+    assert model.connection is None
+
+
+def test_iter_interactions_by_date_consumed_completely():
+    connection = FakeConnection(_history_rows(3))
+    model = _model_with(connection)
+
+    rows = list(model.iter_interactions_by_date(datetime(2026, 1, 1)))
+
+    assert [row['id'] for row in rows] == [0, 1, 2]
+    assert not connection.closed_with_unread
+    assert connection.closed
+
+
+def test_iter_session_interactions_abandoned_releases_connection():
+    connection = FakeConnection(_history_rows(4))
+    model = _model_with(connection)
+
+    for row in model.iter_session_interactions('session'):
+        break
+
+    assert row['metadata'] == {'n': 0}
+    assert not connection.closed_with_unread
+    assert not connection.unread_result
+    assert connection.closed
@@ -0,0 +1,265 @@
+# Pruebas del sumidero io_uring con un módulo liburing simulado
+# El anillo falso ejecuta cada SQE con os.pwrite al llamar a io_uring_submit
+
+import os
+import sys
+import types
+import importlib
+import threading
+
+import pytest
+
+pytestmark = pytest.mark.skipif(sys.platform != 'linux', reason="io_uring solo existe en Linux")
+
+
+class FakeRing:
+    """Anillo con colas de envío y de completado en memoria"""
+
+    def __init__(self):
+        self.sq = []
+        self.cq = []
+
+
+class FakeSqe:
+    """SQE con la escritura preparada y su user_data"""
+
+    def __init__(self):
+        self.write = None
+        self.data = 0
+
+
+def make_liburing():
+    """
+    Construye un módulo liburing falso con las funciones que usa el sumidero
+    Returns:
+        Módulo con contadores de llamadas en fake.calls
+    """
+    fake = types.ModuleType('liburing')
+    fake.calls = {'queue_init': 0, 'queue_init_params': 0, 'queue_exit': 0, 'submit': 0}
+    fake.params = []
+    fake.files = []
+
+    fake.IORING_SETUP_SQPOLL = 1 << 1
+    fake.IORING_SETUP_SQ_AFF = 1 << 2
+    fake.IOSQE_FIXED_FILE = 1
+
+    fake.io_uring = FakeRing
+    fake.io_uring_params = types.SimpleNamespace
+
+    class io_uring_cqe:
+        res = 0
+        data = 0
+
+    fake.io_uring_cqe = io_uring_cqe
+
+    def io_uring_queue_init_params(entries, ring, params):
+        fake.calls['queue_init_params'] += 1
+        fake.params.append(params)
+
+    def io_uring_queue_init(entries, ring, flags):
+        fake.calls['queue_init'] += 1
+
+    def io_uring_queue_exit(ring):
+        fake.calls['queue_exit'] += 1
+
+    def io_uring_submit(ring):
+        fake.calls['submit'] += 1
+        for sqe in ring.sq:
+            fd, data, offset = sqe.write
+            ring.cq.append((os.pwrite(fd, data, offset), sqe.data))
+        ring.sq = []
+
+    def io_uring_get_sqe(ring):
+        sqe = FakeSqe()
+        ring.sq.append(sqe)
+        return sqe
+
+    def io_uring_prep_write(sqe, fd, buf, length, offset):
+        sqe.write = (fd, bytes(buf[:length]), offset)
+
+    def io_uring_prep_write_fixed(sqe, index, buf, length, offset, buf_index):
+        sqe.write = (fake.files[index], bytes(buf[:length]), offset)
+
+    def io_uring_sqe_set_data64(sqe, value):
+        sqe.data = value
+
+    def io_uring_wait_cqe_nr(ring, cqe, count):
+        assert len(ring.cq) >= count
+
+    def io_uring_peek_cqe(ring, cqe):
+        cqe.res, cqe.data = ring.cq[0]
+
+    def io_uring_cqe_seen(ring, cqe):
+        ring.cq.pop(0)
+
+    def io_uring_register_files(ring, fds, count):
+        fake.files[:] = fds
+
+    def io_uring_unregister_files(ring):
+        fake.files.clear()
+
+    fake.io_uring_queue_init_params = io_uring_queue_init_params
+    fake.io_uring_queue_init = io_uring_queue_init
+    fake.io_uring_queue_exit = io_uring_queue_exit
+    fake.io_uring_submit = io_uring_submit
+    fake.io_uring_get_sqe = io_uring_get_sqe
+    fake.io_uring_prep_write = io_uring_prep_write
+    fake.io_uring_prep_write_fixed = io_uring_prep_write_fixed
+    fake.io_uring_sqe_set_data64 = io_uring_sqe_set_data64
+    fake.io_uring_sqe_set_flags = lambda sqe, flags: None
+    fake.io_uring_cqe_get_data64 = lambda cqe: cqe.data
+    fake.io_uring_wait_cqe_nr = io_uring_wait_cqe_nr
+    fake.io_uring_peek_cqe = io_uring_peek_cqe
+    fake.io_uring_cqe_seen = io_uring_cqe_seen
+    fake.io_uring_register_files = io_uring_register_files
+    fake.io_uring_unregister_files = io_uring_unregister_files
+    fake.io_uring_register_buffers = lambda ring, iov, count: None
+    fake.io_uring_unregister_buffers = lambda ring: None
+    fake.iovec = lambda buf: buf
+    return fake
+
+
+def fail(errno: int):
+    """Devuelve una función que siempre lanza OSError con el errno indicado"""
+    def raiser(*args):
+        raise OSError(errno, os.strerror(errno))
+    return raiser
+
+
+@pytest.fixture
+def liburing(monkeypatch):
+    fake = make_liburing()
+    monkeypatch.setitem(sys.modules, 'liburing', fake)
+    return fake
+
+
+@pytest.fixture
+def sink_module(liburing, monkeypatch):
+    # Importación limpia ligada al liburing falso; monkeypatch restaura sys.modules al terminar
+    monkeypatch.delitem(sys.modules, 'utils.uring_log_sink', raising=False)
+    module = importlib.import_module('utils.uring_log_sink')
+    yield module
+    if module._shared_sink is not None:
+        module._shared_sink.close()
+
+
+@pytest.fixture
+def sink(sink_module):
+    instance = sink_module.UringLogSink()
+    yield instance
+    instance.close()
+
+
+def test_sq_thread_is_not_pinned_by_default(sink, liburing):
+    params = liburing.params[0]
+    assert params.flags == liburing.IORING_SETUP_SQPOLL
+    assert not hasattr(params, 'sq_thread_cpu')
+
+
+def test_sq_thread_is_pinned_when_cpu_given(sink_module, liburing):
+    pinned = sink_module.UringLogSink(sq_thread_cpu=3)
+    pinned.close()
+    params = liburing.params[0]
+    assert params.flags == liburing.IORING_SETUP_SQPOLL | liburing.IORING_SETUP_SQ_AFF
+    assert params.sq_thread_cpu == 3
+
+
+def test_sqpoll_failure_falls_back_to_plain_ring(sink_module, liburing, tmp_path):
+    liburing.io_uring_queue_init_params = fail(1)
+    path = tmp_path / 'app.log'
+
+    fallback = sink_module.UringLogSink()
+    index = fallback.add_file(str(path))
+    fallback.write(index, b'uno\n')
+    fallback.close()
+
+    assert liburing.calls['queue_init'] == 1
+    assert path.read_bytes() == b'uno\n'
+
+
+def test_shared_sink_is_none_when_ring_cannot_be_created(sink_module, liburing):
+    liburing.io_uring_queue_init_params = fail(1)
+    liburing.io_uring_queue_init = fail(38)
+
+    assert sink_module.get_shared_sink() is None
+    # El fallo se recuerda: no se reintenta en cada llamada
+    assert sink_module.get_shared_sink() is None
+    assert liburing.calls['queue_init'] == 0
+
+
+def test_pending_records_are_sent_in_one_batch(sink, liburing, tmp_path):
+    path = tmp_path / 'app.log'
+    index = sink.add_file(str(path))
+
+    # El primer envío se detiene hasta que los demás registros están en la cola
+    entered = threading.Event()
+    release = threading.Event()
+    submit = liburing.io_uring_submit
+
+    def blocking_submit(ring):
+        if liburing.calls['submit'] == 0:
+            entered.set()
+            assert release.wait(5)
+        submit(ring)
+
+    liburing.io_uring_submit = blocking_submit
+    sink.write(index, b'0\n')
+    assert entered.wait(5)
+    for i in range(1, 11):
+        sink.write(index, f"{i}\n".encode())
+    release.set()
+    sink.close()
+
+    assert liburing.calls['submit'] == 2
+    assert path.read_bytes() == b''.join(f"{i}\n".encode() for i in range(11))
+
+
+def test_failed_submit_resets_ring_and_keeps_writing(sink_module, sink, liburing, tmp_path):
+    path = tmp_path / 'app.log'
+    index = sink.add_file(str(path))
+    submit = liburing.io_uring_submit
+
+    def failing_once(ring):
+        if liburing.calls['submit'] == 0:
+            liburing.calls['submit'] += 1
+            raise OSError(5, 'boom')
+        submit(ring)
+
+    liburing.io_uring_submit = failing_once
+    fd = os.open(tmp_path / 'op.bin', os.O_WRONLY | os.O_CREAT)
+    future = sink.submit(sink_module.UringOp('write', fd, b'ab', close_fd=True))
+    with pytest.raises(OSError):
+        future.result(5)
+
+    # El anillo se recrea y el hilo sigue atendiendo escrituras
+    assert liburing.calls['queue_exit'] == 1
+    assert liburing.calls['queue_init_params'] == 2
+    assert sink._thread.is_alive()
+
+    sink.write(index, b'despues\n')
+    fd = os.open(tmp_path / 'op2.bin', os.O_WRONLY | os.O_CREAT)
+    assert sink.submit(sink_module.UringOp('write', fd, b'xyz', close_fd=True)).result(5) == 3
+    sink.close()
+    assert path.read_bytes() == b'despues\n'
+    assert (tmp_path / 'op2.bin').read_bytes() == b'xyz'
+
+
+def test_writes_fall_back_to_sync_io_without_ring(sink_module, sink, liburing, tmp_path):
+    path = tmp_path / 'app.log'
+    index = sink.add_file(str(path))
+    liburing.io_uring_submit = fail(5)
+    liburing.io_uring_queue_init_params = fail(1)
+    liburing.io_uring_queue_init = fail(38)
+
+    # El lote fallido pierde su registro y el anillo no puede recrearse
+    fd = os.open(tmp_path / 'op.bin', os.O_WRONLY | os.O_CREAT)
+    with pytest.raises(OSError):
+        sink.submit(sink_module.UringOp('write', fd, b'ab', close_fd=True)).result(5)
+    assert sink._ring is None
+
+    sink.write(index, b'sincrono\n')
+    fd = os.open(tmp_path / 'op2.bin', os.O_WRONLY | os.O_CREAT)
+    assert sink.submit(sink_module.UringOp('write', fd, b'xyz', close_fd=True)).result(5) == 3
+    sink.close()
+    assert path.read_bytes() == b'sincrono\n'
+    assert (tmp_path / 'op2.bin').read_bytes() == b'xyz'
@@ -0,0 +1,58 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# Versión compilada de sanitize_string (ver utils/helpers.py)
+# Recorre el texto una sola vez: elimina los caracteres <>"' y colapsa
+# los espacios en blanco en un único espacio, sin espacios al inicio ni al final
+#
+# Compilación (opcional, requiere Cython y un compilador de C):
+#     cythonize -i utils/_sanitize.pyx
+# Si el módulo no está compilado, helpers.py usa la implementación en Python
+
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+
+
+cdef extern from "Python.h":
+    int PyUnicode_4BYTE_KIND
+    object PyUnicode_FromKindAndData(int kind, const void *buffer, Py_ssize_t size)
+
+
+cpdef str sanitize(str text):
+    """
+    Limpia y sanitiza un string removiendo caracteres especiales
+    Args:
+        text: String a sanitizar
+    Returns:
+        String sanitizado
+    """
+    if not text:
+        return ""
+
+    cdef Py_ssize_t length = len(text)
+    cdef Py_UCS4 *buffer = <Py_UCS4 *> PyMem_Malloc(length * sizeof(Py_UCS4))
+    if buffer == NULL:
+        raise MemoryError()
+
+    cdef Py_ssize_t size = 0
+    cdef bint pending_space = False
+    cdef Py_UCS4 ch
+
+    try:
+        for ch in text:
+            if ch == u'<' or ch == u'>' or ch == u'"' or ch == u"'":
+                continue
+
+            if ch.isspace():
+                # Solo se emite el espacio si después aparece otro carácter
+                pending_space = size > 0
+                continue
+
+            if pending_space:
+                buffer[size] = u' '
+                size += 1
+                pending_space = False
+
+            buffer[size] = ch
+            size += 1
+
+        return PyUnicode_FromKindAndData(PyUnicode_4BYTE_KIND, buffer, size)
+    finally:
+        PyMem_Free(buffer)
@@ -1,12 +1,101 @@
 # Utilidades de autenticación
 # Proporciona funciones para manejo de autenticación y sesiones
 
+import os
+import hmac
+import time
+import base64
+import hashlib
+import secrets
+import threading
+import orjson
 from typing import Optional, Dict, Any, Tuple
 from datetime import datetime
+from cachetools import TTLCache
 from models.user_model import UserModel
-from models.session_model import SessionModel
+from models.session_model import (
+    SessionModel,
+    SESSION_TOKEN_TTL,
+    is_token_revoked,
+    revoke_session_token,
+    revoke_user_tokens
+)
 from utils.logger import app_logger
 
+# Clave para firmar los tokens de sesión. Si no se configura se genera al
+# arrancar, y los tokens emitidos dejan de ser válidos al reiniciar el proceso
+_TOKEN_SECRET = os.getenv('SESSION_TOKEN_SECRET', '').encode('utf-8') or secrets.token_bytes(32)
+_TOKEN_TTL = SESSION_TOKEN_TTL
+
+
+def _b64encode(data: bytes) -> str:
+    """Codifica en base64 URL-safe sin relleno"""
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text: str) -> bytes:
+    """Decodifica base64 URL-safe sin relleno"""
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def is_session_token(value: Optional[str]) -> bool:
+    """
+    Indica si un identificador es un token firmado (los IDs de sesión no contienen '.')
+    Args:
+        value: ID de sesión o token
+    Returns:
+        True si tiene formato de token firmado
+    """
+    return bool(value) and '.' in value
+
+
+def issue_session_token(session_id: str, user: Dict[str, Any], ttl_seconds: int = _TOKEN_TTL) -> str:
+    """
+    Emite un token de sesión firmado con HMAC-SHA256
+    Args:
+        session_id: ID de la sesión en base de datos (permite revocarla)
+        user: Datos del usuario autenticado
+        ttl_seconds: Vigencia del token en segundos
+    Returns:
+        Token con el formato carga.firma
+    """
+    now = int(time.time())
+    payload = _b64encode(orjson.dumps({
+        'sid': session_id,
+        'uid': user['id'],
+        'adm': bool(user.get('is_admin')),
+        'iat': now,
+        'exp': now + ttl_seconds
+    }))
+    signature = hmac.new(_TOKEN_SECRET, payload.encode('ascii'), hashlib.sha256).digest()
+    return f"{payload}.{_b64encode(signature)}"
+
+
+def decode_session_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verifica un token de sesión sin consultar la base de datos
+    Args:
+        token: Token emitido por issue_session_token
+    Returns:
+        Contenido del token o None si la firma no es válida, venció o fue revocado
+    """
+    try:
+        payload, signature = token.split('.', 1)
+        expected = hmac.new(_TOKEN_SECRET, payload.encode('ascii'), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64decode(signature)):
+            return None
+        claims = orjson.loads(_b64decode(payload))
+    except (ValueError, UnicodeError, orjson.JSONDecodeError):
+        return None
+
+    if claims['exp'] <= time.time():
+        return None
+
+    if is_token_revoked(claims):
+        return None
+
+    return claims
+
 
 class AuthManager:
     """
@@ -19,13 +108,18 @@ class AuthManager:
         self.session_model = SessionModel()
         self.current_user = None
         self.current_session = None
+        # Contraseñas verificadas recientemente: {(session_id, sha256): True}
+        # Solo se guardan aciertos, por lo que no ayuda a quien no tiene sesión
+        self._verified_passwords = TTLCache(maxsize=256, ttl=30)
+        self._verified_passwords_lock = threading.Lock()
 
     def login(
         self,
         username: str,
         password: str,
         ip_address: Optional[str] = None,
-        user_agent: Optional[str] = None
+        user_agent: Optional[str] = None,
+        signed_token: bool = False
     ) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
         """
         Inicia sesión de usuario
@@ -34,8 +128,12 @@ class AuthManager:
             password: Contraseña
             ip_address: Dirección IP del cliente
             user_agent: User agent del cliente
+            signed_token: Si devolver un token firmado en lugar del ID de sesión.
+                          La firma se verifica en memoria y la sesión se confirma
+                          con la caché de sesiones de SessionModel, por lo que
+                          logout y desactivaciones se respetan tras reiniciar
         Returns:
-            Tuple (éxito, datos_usuario, session_id)
+            Tuple (éxito, datos_usuario, session_id o token)
         """
         try:
             # Autenticar usuario
@@ -60,10 +158,16 @@ class AuthManager:
             self.current_user = user
             self.current_session = session_id
 
+            with self._verified_passwords_lock:
+                self._verified_passwords[self._password_key(session_id, password)] = True
+
             app_logger.log_authentication(username, True, ip_address)
             app_logger.log_session_event(session_id, "INICIO", user['id'])
             app_logger.log_user_action(user['id'], "LOGIN", f"IP: {ip_address}")
 
+            if signed_token:
+                return True, user, issue_session_token(session_id, user)
+
             return True, user, session_id
 
         except Exception as e:
@@ -79,11 +183,14 @@ class AuthManager:
             True si el logout fue exitoso
         """
         try:
-            target_session = session_id or self.current_session
+            target_session = self._session_id_of(session_id or self.current_session)
 
             if not target_session:
                 return False
 
+            # Los tokens firmados de la sesión dejan de aceptarse
+            revoke_session_token(target_session)
+
             # Expirar la sesión
             success = self.session_model.expire_session(target_session)
 
@@ -98,7 +205,7 @@ class AuthManager:
                 app_logger.log_session_event(target_session, "CIERRE")
 
                 # Limpiar datos actuales si es la sesión actual
-                if target_session == self.current_session:
+                if target_session == self._session_id_of(self.current_session):
                     self.current_user = None
                     self.current_session = None
 
@@ -117,10 +224,12 @@ class AuthManager:
             True si la sesión es válida
         """
         try:
-            # Limpiar sesiones expiradas primero
-            self.session_model.cleanup_expired_sessions()
+            # Los tokens firmados se verifican en memoria
+            if is_session_token(session_id):
+                return self._token_claims(session_id) is not None
 
-            # Validar la sesión específica
+            # get_session ya descarta las sesiones vencidas; su marcado como
+            # inactivas se hace en segundo plano (ver start_session_cleanup)
             session = self.session_model.get_session(session_id)
 
             if session:
@@ -148,6 +257,13 @@ class AuthManager:
             if not target_session:
                 return None
 
+            if is_session_token(target_session):
+                claims = self._token_claims(target_session)
+                if not claims:
+                    return None
+                user = self.user_model.get_user_by_id(claims['uid'])
+                return user if user and user['is_active'] else None
+
             if not self.validate_session(target_session):
                 return None
 
@@ -185,12 +301,34 @@ class AuthManager:
         Returns:
             Tuple (es_admin, datos_usuario)
         """
-        authenticated, user = self.require_authentication(session_id)
-
-        if not authenticated or not user:
+        if is_session_token(session_id):
+            claims = self._token_claims(session_id)
+            if not claims:
+                return False, None
+            user_id = claims['uid']
+        else:
+            session = self.session_model.get_session(session_id)
+            if not session:
+                return False, None
+            self.session_model.update_session_activity(session_id)
+            user_id = session['user_id']
+
+        # El rol y el estado se leen del usuario en caché, no del token: un token
+        # emitido antes de un cambio de permisos no los conserva
+        user = self.user_model.get_user_by_id(user_id)
+        if not user or not user['is_active']:
             return False, None
+        return self._check_admin(user)
 
-        is_admin = user.get('is_admin', False)
+    def _check_admin(self, user: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Comprueba el rol de administrador de un usuario
+        Args:
+            user: Datos del usuario con id e is_admin
+        Returns:
+            Tuple (es_admin, datos_usuario)
+        """
+        is_admin = bool(user.get('is_admin'))
 
         if not is_admin:
             app_logger.log_user_action(
@@ -248,8 +386,22 @@ class AuthManager:
             if not authenticated or not user:
                 return False
 
-            # Verificar contraseña actual
-            if not self.user_model.verify_password(current_password, user.get('password_hash', '')):
+            # Verificar contraseña actual (evita repetir bcrypt si se verificó
+            # en esta sesión hace menos de 30 segundos)
+            password_key = self._password_key(self._session_id_of(session_id), current_password)
+            with self._verified_passwords_lock:
+                verified = self._verified_passwords.get(password_key, False)
+
+            if not verified:
+                credentials = self.user_model._get_user_auth_cols(user['username'])
+                verified = bool(credentials) and self.user_model.verify_password(
+                    current_password, credentials['password_hash']
+                )
+                if verified:
+                    with self._verified_passwords_lock:
+                        self._verified_passwords[password_key] = True
+
+            if not verified:
                 app_logger.log_user_action(
                     user['id'],
                     "CAMBIO_PASSWORD_FALLIDO",
@@ -260,11 +412,17 @@ class AuthManager:
             # Actualizar contraseña
             success = self.user_model.update_password(user['id'], new_password)
 
+            # La contraseña anterior deja de ser válida
+            with self._verified_passwords_lock:
+                self._verified_passwords.pop(password_key, None)
+
             if success:
                 app_logger.log_user_action(user['id'], "CAMBIO_PASSWORD", "Exitoso")
 
                 # Expirar otras sesiones del usuario por seguridad
-                self.session_model.expire_user_sessions(user['id'], session_id)
+                current_session = self._session_id_of(session_id)
+                self.session_model.expire_user_sessions(user['id'], current_session)
+                revoke_user_tokens(user['id'], current_session)
 
             return success
 
@@ -272,6 +430,54 @@ class AuthManager:
             app_logger.log_exception("Error al cambiar contraseña", e)
             return False
 
+    def _token_claims(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Verifica un token firmado y confirma que su sesión siga vigente
+        Las revocaciones en memoria se pierden al reiniciar el proceso o al
+        desalojarse de la caché, mientras que la clave de firma puede persistir:
+        la sesión se comprueba con get_session, que usa su caché de 30 segundos
+        y solo consulta la base de datos cuando no la encuentra
+        Args:
+            token: Token emitido por issue_session_token
+        Returns:
+            Contenido del token o None si no es válido o su sesión terminó
+        """
+        claims = decode_session_token(token)
+        if not claims:
+            return None
+
+        # get_session descarta sesiones cerradas, vencidas o de usuarios inactivos
+        if self.session_model.get_session(claims['sid']) is None:
+            return None
+
+        return claims
+
+    @staticmethod
+    def _session_id_of(value: Optional[str]) -> Optional[str]:
+        """
+        Obtiene el ID de sesión de un ID o de un token firmado
+        Args:
+            value: ID de sesión o token
+        Returns:
+            ID de sesión o None si el token no es válido
+        """
+        if not is_session_token(value):
+            return value
+        claims = decode_session_token(value)
+        return claims['sid'] if claims else None
+
+    @staticmethod
+    def _password_key(session_id: str, password: str) -> Tuple[str, bytes]:
+        """
+        Construye la clave de la caché de verificaciones sin guardar la contraseña
+        Args:
+            session_id: ID de la sesión
+            password: Contraseña en texto plano
+        Returns:
+            Tupla (session_id, sha256 de la contraseña)
+        """
+        return session_id, hashlib.sha256(password.encode('utf-8')).digest()
+
     def get_user_sessions(self, user_id: int) -> list:
         """
         Obtiene las sesiones activas de un usuario
@@ -296,7 +502,9 @@ class AuthManager:
             Número de sesiones terminadas
         """
         try:
+            except_session = self._session_id_of(except_session)
             terminated = self.session_model.expire_user_sessions(user_id, except_session)
+            revoke_user_tokens(user_id, except_session)
 
             if terminated > 0:
                 app_logger.log_user_action(
@@ -332,6 +540,33 @@ class AuthManager:
             app_logger.log_exception("Error al limpiar sesiones", e)
             return 0
 
+    def start_session_cleanup(
+        self,
+        interval_seconds: int = 60,
+        worker: Optional['AuthManager'] = None
+    ) -> threading.Timer:
+        """
+        Programa la limpieza periódica de sesiones expiradas en segundo plano
+        Args:
+            interval_seconds: Intervalo entre ejecuciones
+            worker: Instancia que ejecuta la limpieza (se crea en la primera llamada)
+        Returns:
+            Temporizador programado
+        """
+        # Instancia propia del hilo de limpieza para no compartir la conexión
+        # con otros hilos; se reutiliza en cada ejecución
+        if worker is None:
+            worker = AuthManager()
+
+        def run_cleanup():
+            worker.cleanup_expired_sessions()
+            self.start_session_cleanup(interval_seconds, worker)
+
+        timer = threading.Timer(interval_seconds, run_cleanup)
+        timer.daemon = True
+        timer.start()
+        return timer
+
     def get_session_statistics(self) -> Dict[str, Any]:
         """
         Obtiene estadísticas de sesiones
@@ -371,8 +606,9 @@ auth_manager = AuthManager()
 
 
 # Funciones de conveniencia para usar directamente
-def login(username: str, password: str, ip_address: str = None, user_agent: str = None):
-    return auth_manager.login(username, password, ip_address, user_agent)
+def login(username: str, password: str, ip_address: str = None, user_agent: str = None,
+          signed_token: bool = False):
+    return auth_manager.login(username, password, ip_address, user_agent, signed_token)
 
 
 def logout(session_id: str = None):
@@ -0,0 +1,45 @@
+# Handler de archivo con rotación optimizado
+# RotatingFileHandler consulta os.path.exists/os.path.isfile en cada registro;
+# aquí solo se consulta el sistema de archivos cuando la rotación está cerca
+
+import os
+import logging
+from logging.handlers import RotatingFileHandler
+
+
+class FastRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler que evita las llamadas stat por registro.
+    Comprueba que el log sea un archivo regular solo cuando se alcanza el
+    tamaño máximo, y recuerda el resultado una vez confirmado.
+    La rotación se decide con el tamaño ya escrito, sin formatear el registro,
+    por lo que un archivo puede exceder maxBytes en a lo sumo un registro
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._is_regular_file = False
+        super().__init__(*args, **kwargs)
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        """
+        Determina si se debe rotar el archivo antes de escribir el registro
+        Args:
+            record: Registro a escribir (no se usa)
+        Returns:
+            True si el archivo debe rotarse
+        """
+        if self.stream is None:
+            self.stream = self._open()
+
+        if self.maxBytes <= 0:
+            return False
+
+        # Solo se usa el tamaño actual: formatear el registro aquí para medirlo
+        # duplicaría el trabajo del formatter, que emit() vuelve a ejecutar
+        if self.stream.tell() < self.maxBytes:
+            return False
+
+        # Solo se rota un archivo regular (no /dev/null, pipes, etc.)
+        if not self._is_regular_file:
+            self._is_regular_file = os.path.isfile(self.baseFilename)
+        return self._is_regular_file
@@ -6,6 +6,38 @@ import re
 import hashlib
 from datetime import datetime, timedelta
 
+# Numba es opcional: si está instalado, la aritmética de paginación se compila
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Versión compilada de sanitize_string (utils/_sanitize.pyx), si está disponible
+try:
+    from utils._sanitize import sanitize as _sanitize_compiled
+except ImportError:
+    _sanitize_compiled = None
+
+# Patrones compilados una sola vez al importar el módulo
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_WS_RE = re.compile(r'\s+')
+
+# Tabla de traducción que elimina los caracteres especiales peligrosos
+_STRIP_TABLE = str.maketrans('', '', '<>"\'')
+
+# Funciones de hash disponibles (implementadas por OpenSSL en hashlib)
+_HASHERS = {
+    'md5': hashlib.md5,
+    'sha1': hashlib.sha1,
+    'sha256': hashlib.sha256
+}
+
+# Nombres de los meses en español, indexados por dt.month - 1
+MONTHS = (
+    'enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio',
+    'julio', 'agosto', 'septiembre', 'octubre', 'noviembre', 'diciembre'
+)
+
 
 def validate_email(email):
     """
@@ -15,8 +47,7 @@ def validate_email(email):
     Returns:
         Boolean indicando si el email es válido
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return EMAIL_RE.match(email) is not None
 
 
 def sanitize_string(text):
@@ -30,28 +61,25 @@ def sanitize_string(text):
     if not text:
         return ""
 
-    # Remover caracteres especiales peligrosos
-    text = re.sub(r'[<>"\']', '', text)
-    # Remover espacios extras
-    text = ' '.join(text.split())
-    return text.strip()
+    if _sanitize_compiled is not None:
+        return _sanitize_compiled(text)
+
+    # Remover caracteres especiales peligrosos (una pasada en C con translate)
+    # y colapsar los espacios extras
+    return _WS_RE.sub(' ', text.translate(_STRIP_TABLE)).strip()
 
 
 def generate_hash(text, algorithm='sha256'):
     """
     Genera un hash de un texto usando el algoritmo especificado
     Args:
-        text: Texto a hashear
+        text: Texto a hashear (str o bytes; los bytes no se vuelven a codificar)
         algorithm: Algoritmo a usar (sha256, md5, sha1)
     Returns:
         String con el hash generado
     """
-    if algorithm == 'md5':
-        return hashlib.md5(text.encode()).hexdigest()
-    elif algorithm == 'sha1':
-        return hashlib.sha1(text.encode()).hexdigest()
-    else:  # sha256 por defecto
-        return hashlib.sha256(text.encode()).hexdigest()
+    data = text if isinstance(text, bytes) else text.encode()
+    return _HASHERS.get(algorithm, hashlib.sha256)(data).hexdigest()
 
 
 def format_datetime_spanish(dt):
@@ -62,18 +90,27 @@ def format_datetime_spanish(dt):
     Returns:
         String con la fecha formateada en español
     """
-    months = {
-        1: 'enero', 2: 'febrero', 3: 'marzo', 4: 'abril',
-        5: 'mayo', 6: 'junio', 7: 'julio', 8: 'agosto',
-        9: 'septiembre', 10: 'octubre', 11: 'noviembre', 12: 'diciembre'
-    }
+    return f"{dt.day} de {MONTHS[dt.month - 1]} de {dt.year} a las {dt:%H:%M}"
+
+
+def _page_bounds(total, page, per_page):
+    """
+    Calcula los límites de una página
+    Args:
+        total: Número total de resultados
+        page: Número de página (inicia en 1)
+        per_page: Resultados por página
+    Returns:
+        Tupla (inicio, fin, total_de_páginas)
+    """
+    start = (page - 1) * per_page
+    end = start + per_page
+    return start, end, (total + per_page - 1) // per_page
 
-    day = dt.day
-    month = months[dt.month]
-    year = dt.year
-    hour = dt.strftime('%H:%M')
 
-    return f"{day} de {month} de {year} a las {hour}"
+if njit is not None:
+    # Firma explícita: se compila al importar y no en la primera llamada
+    _page_bounds = njit('UniTuple(int64, 3)(int64, int64, int64)', cache=True)(_page_bounds)
 
 
 def paginate_results(results, page=1, per_page=10):
@@ -87,9 +124,10 @@ def paginate_results(results, page=1, per_page=10):
         Diccionario con los resultados paginados y metadatos
     """
     total = len(results)
-    start = (page - 1) * per_page
-    end = start + per_page
+    # La firma compilada es int64: se normalizan page/per_page (p. ej. enteros de numpy)
+    start, end, total_pages = _page_bounds(total, int(page), int(per_page))
 
+    # El corte de la lista se hace en Python
     paginated_results = results[start:end]
 
     return {
@@ -98,7 +136,7 @@ def paginate_results(results, page=1, per_page=10):
             'current_page': page,
             'per_page': per_page,
             'total_items': total,
-            'total_pages': (total + per_page - 1) // per_page,
+            'total_pages': total_pages,
             'has_next': end < total,
             'has_prev': page > 1
         }
@@ -2,12 +2,89 @@
 # Proporciona logging con rotación de archivos y colores en consola
 
 import os
+import time
+import atexit
 import logging
-import colorlog
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
 from typing import Optional
-from config.app_config import AppConfig
+from config.app_config_cache import get_app_config
+from utils.fast_rotating_handler import FastRotatingFileHandler
+from utils.uring_log_sink import UringFileHandler, UringOp, get_shared_sink
+
+# Caché de la fecha formateada por segundo: (segundo epoch, archivo, consola)
+# Todos los registros de un mismo segundo comparten el mismo texto. Es una tupla
+# que se reemplaza entera: otro hilo nunca ve el segundo nuevo con el texto viejo
+_ts_cache = (0, '', '')
+
+
+def fast_time(record: logging.LogRecord) -> tuple:
+    """
+    Actualiza la caché de fechas si el registro pertenece a otro segundo
+    Args:
+        record: Registro de log
+    Returns:
+        Tupla (segundo, fecha completa, hora) del segundo del registro
+    """
+    global _ts_cache
+    cached = _ts_cache
+    second = int(record.created)
+    if second != cached[0]:
+        local = time.localtime(second)
+        cached = _ts_cache = (
+            second,
+            time.strftime('%Y-%m-%d %H:%M:%S', local),
+            time.strftime('%H:%M:%S', local)
+        )
+    return cached
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter de archivo que toma la fecha de la caché por segundo"""
+
+    def formatTime(self, record, datefmt=None):
+        return fast_time(record)[1]
+
+
+class _AnsiFmt(logging.Formatter):
+    """
+    Formatter de consola con colores ANSI precalculados por nivel
+    y la hora tomada de la caché por segundo
+    """
+
+    _COLORS = {
+        logging.DEBUG: '\x1b[36m',          # cyan
+        logging.INFO: '\x1b[32m',           # verde
+        logging.WARNING: '\x1b[33m',        # amarillo
+        logging.ERROR: '\x1b[31m',          # rojo
+        logging.CRITICAL: '\x1b[31;47m',    # rojo sobre blanco
+    }
+    _RESET = '\x1b[0m'
+
+    def format(self, record):
+        return self._COLORS.get(record.levelno, '') + super().format(record) + self._RESET
+
+    def formatTime(self, record, datefmt=None):
+        return fast_time(record)[2]
+
+
+class ChatLogRecord(logging.LogRecord):
+    """
+    Registro de log de una interacción de chat.
+    Los datos de la interacción se asignan directamente como atributos,
+    sin construir el diccionario extra que makeRecord debe validar y fusionar.
+    Quedan en __dict__ para que los formatters puedan usarlos (%(user_id)s, etc.)
+    """
+
+    def __init__(self, name, level, pathname, lineno, msg, args, func,
+                 user_id, session_id, user_message_length, agent_response_length, response_time_ms):
+        super().__init__(name, level, pathname, lineno, msg, args, None, func)
+        self.user_id = user_id
+        self.session_id = session_id
+        self.user_message_length = user_message_length
+        self.agent_response_length = agent_response_length
+        self.response_time_ms = response_time_ms
 
 
 class Logger:
@@ -20,10 +97,12 @@ class Logger:
     """
 
     def __init__(self, name: str = "LiveChat-IA"):
-        self.app_config = AppConfig()
+        self.app_config = get_app_config()
         self.name = name
         self.logs_dir = "logs"
         self.logger = None
+        self.listener = None
+        self.sink = None
         self.setup_logger()
 
     def ensure_logs_directory(self):
@@ -34,81 +113,86 @@ class Logger:
     def setup_logger(self):
         """Configura el logger con handlers de archivo y consola"""
         self.ensure_logs_directory()
+        self._debug = self.app_config.is_debug_mode()
 
         # Crear logger principal
         self.logger = logging.getLogger(self.name)
-        self.logger.setLevel(logging.DEBUG)
+        # Nivel según LOG_LEVEL: los registros por debajo se descartan en
+        # isEnabledFor sin construir el mensaje
+        level = getattr(logging, self.app_config.get_log_level(), None)
+        self.logger.setLevel(level if isinstance(level, int) else logging.DEBUG)
 
         # Evitar duplicar handlers si ya existen
         if self.logger.handlers:
             return
 
         # Configurar formato para archivos
-        file_formatter = logging.Formatter(
+        file_formatter = _CachedTimeFormatter(
             '%(asctime)s | %(name)s | %(levelname)s | %(filename)s:%(lineno)d | %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
 
         # Configurar formato para consola con colores
-        console_formatter = colorlog.ColoredFormatter(
-            '%(log_color)s%(asctime)s | %(name)s | %(levelname)s | %(message)s%(reset)s',
-            datefmt='%H:%M:%S',
-            log_colors={
-                'DEBUG': 'cyan',
-                'INFO': 'green',
-                'WARNING': 'yellow',
-                'ERROR': 'red',
-                'CRITICAL': 'red,bg_white',
-            }
+        console_formatter = _AnsiFmt(
+            '%(asctime)s | %(name)s | %(levelname)s | %(message)s',
+            datefmt='%H:%M:%S'
         )
 
-        # Handler para archivo principal (todos los logs)
-        main_log_file = os.path.join(self.logs_dir, f"{self.name.lower()}.log")
-        main_handler = RotatingFileHandler(
-            main_log_file,
-            maxBytes=10*1024*1024,  # 10MB
-            backupCount=5,
-            encoding='utf-8'
-        )
-        main_handler.setLevel(logging.DEBUG)
-        main_handler.setFormatter(file_formatter)
-
-        # Handler para errores (solo errores y críticos)
-        error_log_file = os.path.join(self.logs_dir, f"{self.name.lower()}_errors.log")
-        error_handler = RotatingFileHandler(
-            error_log_file,
-            maxBytes=5*1024*1024,  # 5MB
-            backupCount=3,
-            encoding='utf-8'
-        )
-        error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(file_formatter)
-
-        # Handler para log diario
-        daily_log_file = os.path.join(
-            self.logs_dir,
-            f"{self.name.lower()}_{datetime.now().strftime('%Y%m%d')}.log"
-        )
-        daily_handler = RotatingFileHandler(
-            daily_log_file,
-            maxBytes=50*1024*1024,  # 50MB
-            backupCount=1,
-            encoding='utf-8'
-        )
-        daily_handler.setLevel(logging.INFO)
-        daily_handler.setFormatter(file_formatter)
+        # Archivos de log: (ruta, tamaño máximo, respaldos, nivel)
+        log_files = [
+            # Archivo principal (todos los logs)
+            (os.path.join(self.logs_dir, f"{self.name.lower()}.log"),
+             10*1024*1024, 5, logging.DEBUG),  # 10MB
+            # Errores (solo errores y críticos)
+            (os.path.join(self.logs_dir, f"{self.name.lower()}_errors.log"),
+             5*1024*1024, 3, logging.ERROR),  # 5MB
+            # Log diario
+            (os.path.join(self.logs_dir, f"{self.name.lower()}_{datetime.now().strftime('%Y%m%d')}.log"),
+             50*1024*1024, 1, logging.INFO),  # 50MB
+        ]
 
         # Handler para consola (solo si está en modo debug)
-        if self.app_config.is_debug_mode():
+        if self._debug:
             console_handler = logging.StreamHandler()
             console_handler.setLevel(logging.INFO)
             console_handler.setFormatter(console_formatter)
             self.logger.addHandler(console_handler)
 
-        # Agregar handlers al logger
-        self.logger.addHandler(main_handler)
-        self.logger.addHandler(error_handler)
-        self.logger.addHandler(daily_handler)
+        # None si io_uring no está disponible o el kernel no permite crear el anillo
+        self.sink = get_shared_sink()
+        if self.sink is not None:
+            # Las escrituras salen del hilo que registra: el QueueHandler solo encola
+            # y el QueueListener entrega los registros al sumidero io_uring
+            file_handlers = []
+            for path, max_bytes, backup_count, level in log_files:
+                handler = UringFileHandler(self.sink, path, max_bytes, backup_count)
+                handler.setLevel(level)
+                handler.setFormatter(file_formatter)
+                file_handlers.append(handler)
+
+            log_queue = Queue(-1)
+            self.listener = QueueListener(log_queue, *file_handlers, respect_handler_level=True)
+            self.listener.start()
+            self.logger.addHandler(QueueHandler(log_queue))
+            atexit.register(self.stop_listener)
+            return
+
+        for path, max_bytes, backup_count, level in log_files:
+            handler = FastRotatingFileHandler(
+                path,
+                maxBytes=max_bytes,
+                backupCount=backup_count,
+                encoding='utf-8'
+            )
+            handler.setLevel(level)
+            handler.setFormatter(file_formatter)
+            self.logger.addHandler(handler)
+
+    def stop_listener(self):
+        """Vacía la cola de logs hacia el sumidero io_uring (que se cierra al salir)"""
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
 
     def debug(self, message: str, extra: Optional[dict] = None):
         """Log nivel DEBUG"""
@@ -136,17 +220,15 @@ class Logger:
 
     def log_user_action(self, user_id: int, action: str, details: Optional[str] = None):
         """Log específico para acciones de usuario"""
-        message = f"Usuario {user_id} - {action}"
-        if details:
-            message += f" - {details}"
-        self.info(message)
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info("Usuario %s - %s%s", user_id, action, f" - {details}" if details else "")
 
     def log_system_event(self, event: str, details: Optional[dict] = None):
         """Log específico para eventos del sistema"""
-        message = f"Sistema - {event}"
-        if details:
-            message += f" - {details}"
-        self.info(message)
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info("Sistema - %s%s", event, f" - {details}" if details else "")
 
     def log_chat_interaction(
         self,
@@ -157,67 +239,70 @@ class Logger:
         response_time_ms: Optional[int] = None
     ):
         """Log específico para interacciones de chat"""
-        message = f"Chat - Usuario: {user_id or 'Anónimo'}, Sesión: {session_id or 'N/A'}"
-        if response_time_ms:
-            message += f", Tiempo: {response_time_ms}ms"
-
-        details = {
-            'user_message_length': len(user_message),
-            'agent_response_length': len(agent_response),
-            'response_time_ms': response_time_ms
-        }
-
-        self.info(message, extra=details)
+        # Evita construir el mensaje y los detalles si INFO está deshabilitado
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        fn, lno, func, _ = self.logger.findCaller()
+        record = ChatLogRecord(
+            self.logger.name, logging.INFO, fn, lno,
+            "Chat - Usuario: %s, Sesión: %s%s",
+            (user_id or 'Anónimo', session_id or 'N/A',
+             f", Tiempo: {response_time_ms}ms" if response_time_ms else ""),
+            func,
+            user_id, session_id, len(user_message), len(agent_response), response_time_ms
+        )
+        self.logger.handle(record)
 
     def log_database_operation(self, operation: str, table: str, success: bool, details: Optional[str] = None):
         """Log específico para operaciones de base de datos"""
-        status = "ÉXITO" if success else "ERROR"
-        message = f"BD - {operation} en {table} - {status}"
-        if details:
-            message += f" - {details}"
-
-        if success:
-            self.info(message)
-        else:
-            self.error(message)
+        level = logging.INFO if success else logging.ERROR
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(
+            level,
+            "BD - %s en %s - %s%s",
+            operation, table, "ÉXITO" if success else "ERROR", f" - {details}" if details else ""
+        )
 
     def log_authentication(self, username: str, success: bool, ip_address: Optional[str] = None):
         """Log específico para intentos de autenticación"""
-        status = "ÉXITO" if success else "FALLO"
-        message = f"Auth - {username} - {status}"
-        if ip_address:
-            message += f" - IP: {ip_address}"
-
-        if success:
-            self.info(message)
-        else:
-            self.warning(message)
+        level = logging.INFO if success else logging.WARNING
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(
+            level,
+            "Auth - %s - %s%s",
+            username, "ÉXITO" if success else "FALLO", f" - IP: {ip_address}" if ip_address else ""
+        )
 
     def log_session_event(self, session_id: str, event: str, user_id: Optional[int] = None):
         """Log específico para eventos de sesión"""
-        message = f"Sesión - {event} - ID: {session_id}"
-        if user_id:
-            message += f" - Usuario: {user_id}"
-
-        self.info(message)
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info("Sesión - %s - ID: %s%s", event, session_id, f" - Usuario: {user_id}" if user_id else "")
 
     def log_report_generation(self, report_type: str, file_path: str, success: bool):
         """Log específico para generación de reportes"""
-        status = "GENERADO" if success else "ERROR"
-        message = f"Reporte - {report_type} - {status} - {file_path}"
-
-        if success:
-            self.info(message)
-        else:
-            self.error(message)
+        level = logging.INFO if success else logging.ERROR
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(
+            level,
+            "Reporte - %s - %s - %s",
+            report_type, "GENERADO" if success else "ERROR", file_path
+        )
 
     def log_startup(self, version: str, environment: str):
         """Log específico para inicio de aplicación"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         message = f"INICIO - {self.app_config.get_app_name()} v{version} - Entorno: {environment}"
         self.info(message)
 
     def log_shutdown(self):
         """Log específico para cierre de aplicación"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         message = f"CIERRE - {self.app_config.get_app_name()} cerrando correctamente"
         self.info(message)
 
@@ -225,16 +310,17 @@ class Logger:
         """Obtiene la lista de archivos de log existentes"""
         log_files = []
         if os.path.exists(self.logs_dir):
-            for file in os.listdir(self.logs_dir):
-                if file.endswith('.log'):
-                    file_path = os.path.join(self.logs_dir, file)
-                    file_size = os.path.getsize(file_path)
-                    log_files.append({
-                        'name': file,
-                        'path': file_path,
-                        'size_bytes': file_size,
-                        'size_mb': round(file_size / (1024 * 1024), 2)
-                    })
+            # scandir reutiliza los datos del recorrido del directorio
+            with os.scandir(self.logs_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.log'):
+                        file_size = entry.stat().st_size
+                        log_files.append({
+                            'name': entry.name,
+                            'path': entry.path,
+                            'size_bytes': file_size,
+                            'size_mb': round(file_size / (1024 * 1024), 2)
+                        })
         return log_files
 
     def cleanup_old_logs(self, days_to_keep: int = 7):
@@ -245,16 +331,36 @@ class Logger:
         cutoff_date = datetime.now().timestamp() - (days_to_keep * 24 * 60 * 60)
         deleted_count = 0
 
-        for file in os.listdir(self.logs_dir):
-            if file.endswith('.log'):
-                file_path = os.path.join(self.logs_dir, file)
-                if os.path.getmtime(file_path) < cutoff_date:
+        with os.scandir(self.logs_dir) as entries:
+            old_logs = [
+                entry for entry in entries
+                if entry.name.endswith('.log') and entry.stat().st_mtime < cutoff_date
+            ]
+
+        sink = get_shared_sink() if old_logs else None
+        if sink is not None:
+            # Todas las eliminaciones se envían al kernel en un único lote
+            dir_fd = os.open(self.logs_dir, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                removals = [
+                    (entry, sink.submit(UringOp('unlinkat', dir_fd, os.fsencode(entry.name))))
+                    for entry in old_logs
+                ]
+                for entry, future in removals:
                     try:
-                        os.remove(file_path)
+                        future.result()
                         deleted_count += 1
-                        self.info(f"Log antiguo eliminado: {file}")
                     except OSError as e:
-                        self.error(f"Error al eliminar log {file}: {e}")
+                        self.error(f"Error al eliminar log {entry.name}: {e}")
+            finally:
+                os.close(dir_fd)
+        else:
+            for entry in old_logs:
+                try:
+                    os.remove(entry.path)
+                    deleted_count += 1
+                except OSError as e:
+                    self.error(f"Error al eliminar log {entry.name}: {e}")
 
         if deleted_count > 0:
             self.info(f"Limpieza completada: {deleted_count} logs eliminados")
@@ -266,11 +372,13 @@ app_logger = Logger()
 
 # Funciones de conveniencia para usar directamente
 def debug(message: str, extra: Optional[dict] = None):
-    app_logger.debug(message, extra)
+    if app_logger.logger.isEnabledFor(logging.DEBUG):
+        app_logger.debug(message, extra)
 
 
 def info(message: str, extra: Optional[dict] = None):
-    app_logger.info(message, extra)
+    if app_logger.logger.isEnabledFor(logging.INFO):
+        app_logger.info(message, extra)
 
 
 def warning(message: str, extra: Optional[dict] = None):
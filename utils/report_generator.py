@@ -2,10 +2,213 @@
 # Crea y gestiona reportes del sistema de forma automática
 
 import os
-import json
-from datetime import datetime
+import sys
+import time
+import string
+import functools
+import orjson
+from collections import Counter
+from concurrent.futures import Future, wait
 from typing import Dict, List, Any, Optional
-from config.app_config import AppConfig
+from config.app_config_cache import get_app_config
+from utils.uring_log_sink import UringOp, get_shared_sink
+# Prefijos de los nombres de archivo de cada tipo de reporte
+REPORT_PREFIXES = ('chat', 'system', 'error', 'daily')
+
+
+def _report_write_done(filepath: str, future: Future):
+    """Informa de una escritura asíncrona de reporte que falló"""
+    error = future.exception()
+    if error is not None:
+        print(f"Error al escribir reporte {filepath}: {error}", file=sys.stderr)
+
+
+def _dumps(data: Any) -> bytes:
+    """Serializa los metadatos de un reporte como JSON indentado en UTF-8"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+
+# Caché de timestamps por segundo: (segundo epoch, para archivo, legible)
+# La tupla se reemplaza entera para que los hilos la lean siempre consistente
+_ts_cache = (0, '', '')
+
+
+def _timestamps() -> tuple:
+    """Devuelve los timestamps del segundo actual, formateándolos solo al cambiar de segundo"""
+    global _ts_cache
+    cached = _ts_cache
+    second = int(time.time())
+    if second != cached[0]:
+        local = time.localtime(second)
+        cached = _ts_cache = (
+            second,
+            time.strftime("%Y%m%d_%H%M%S", local),
+            time.strftime("%Y-%m-%d %H:%M:%S", local)
+        )
+    return cached
+
+
+# Plantillas de los reportes, compiladas una sola vez al importar el módulo.
+# Cada reporte se escribe en tres partes: encabezado, JSON y cierre
+_CHAT_TPL = string.Template("""# Reporte de Interacción de Chat
+
+**Fecha y Hora:** ${readable_ts}
+**Tipo de Reporte:** Interacción de Chat
+**ID de Reporte:** ${ts}
+
+## Información de la Sesión
+
+- **Usuario:** ${user}
+- **Sesión ID:** ${session_id}
+- **Agente:** ${agent}
+
+## Detalles de la Interacción
+
+### Mensaje del Usuario
+```
+${user_message}
+```
+
+### Respuesta del Agente
+```
+${agent_response}
+```
+
+## Métricas de Rendimiento
+
+- **Tiempo de Respuesta:** ${rt}ms
+- **Tokens Utilizados:** ${tokens}
+- **Longitud del Mensaje:** ${um_len} caracteres
+- **Longitud de la Respuesta:** ${ar_len} caracteres
+
+## Metadatos Técnicos
+
+```json
+""")
+
+_STATUS_TPL = string.Template("""# Reporte de Estado del Sistema
+
+**Fecha y Hora:** ${readable_ts}
+**Tipo de Reporte:** Estado del Sistema
+**ID de Reporte:** ${ts}
+
+## Información General
+
+- **Aplicación:** ${app}
+- **Entorno:** ${env}
+- **Modo Debug:** ${debug}
+- **Zona Horaria:** ${tz}
+
+## Estado de Componentes
+
+### Base de Datos
+- **Estado:** ${db_status}
+- **Conexiones Activas:** ${active_connections}
+- **Última Verificación:** ${last_db_check}
+
+### Sistema de Archivos
+- **Carpeta Logs:** ${logs_dir}
+- **Carpeta Reportes:** ${reports_dir}
+- **Espacio en Disco:** ${disk_space}
+
+### Memoria y Rendimiento
+- **Uso de Memoria:** ${memory_usage}
+- **Tiempo de Actividad:** ${uptime}
+- **Sesiones Activas:** ${active_sessions}
+
+## Estadísticas de Uso
+
+- **Total de Usuarios:** ${total_users}
+- **Interacciones Hoy:** ${interactions_today}
+- **Reportes Generados:** ${reports_generated}
+
+## Datos Técnicos
+
+```json
+""")
+
+_ERROR_TPL = string.Template("""# Reporte de Error
+
+**Fecha y Hora:** ${readable_ts}
+**Tipo de Reporte:** Error del Sistema
+**ID de Reporte:** ${ts}
+**Nivel de Severidad:** ${severity}
+
+## Información del Error
+
+- **Tipo de Error:** ${error_type}
+- **Mensaje:** ${error_message}
+- **Aplicación:** ${app}
+- **Entorno:** ${env}
+
+## Stack Trace
+
+```
+${stack_trace}
+```
+
+## Contexto del Error
+
+```json
+""")
+
+# Cierre de los reportes, escrito después del bloque JSON
+_TRAILER_TPL = string.Template("""
+```
+
+---
+*Reporte generado automáticamente por ${app}*
+""")
+
+_ERROR_TRAILER_TPL = string.Template("""
+```
+
+## Acciones Recomendadas
+
+1. Revisar los logs del sistema
+2. Verificar la configuración de la aplicación
+3. Comprobar la conectividad de la base de datos
+4. Revisar el uso de recursos del sistema
+
+---
+*Reporte generado automáticamente por ${app}*
+""")
+
+_DAILY_TPL = string.Template("""# Resumen Diario - ${date}
+
+**Fecha y Hora de Generación:** ${readable_ts}
+**Tipo de Reporte:** Resumen Diario
+**ID de Reporte:** ${ts}
+
+## Estadísticas del Día
+
+### Actividad de Usuarios
+- **Usuarios Activos:** ${active_users}
+- **Nuevos Usuarios:** ${new_users}
+- **Sesiones Iniciadas:** ${sessions_started}
+- **Tiempo Promedio de Sesión:** ${avg_session_time}
+
+### Interacciones de Chat
+- **Total de Mensajes:** ${total_messages}
+- **Mensajes de Usuario:** ${user_messages}
+- **Respuestas del Agente:** ${agent_responses}
+- **Tiempo Promedio de Respuesta:** ${avg_response_time}
+
+### Sistema
+- **Reportes Generados:** ${reports_generated}
+- **Errores Registrados:** ${errors_logged}
+- **Tiempo de Actividad:** ${system_uptime}
+
+## Tendencias
+
+- **Hora de Mayor Actividad:** ${peak_hour}
+- **Agente Más Utilizado:** ${most_used_agent}
+- **Tipo de Consulta Más Común:** ${common_query_type}
+
+## Datos Completos
+
+```json
+""")
 
 
 class ReportGenerator:
@@ -15,8 +218,20 @@ class ReportGenerator:
     """
 
     def __init__(self):
-        self.app_config = AppConfig()
+        self.app_config = get_app_config()
+        self._app_name = self.app_config.get_app_name()
+        self._env = self.app_config.get_environment()
+        self._trailer = _TRAILER_TPL.substitute(app=self._app_name).encode('utf-8')
+        self._error_trailer = _ERROR_TRAILER_TPL.substitute(app=self._app_name).encode('utf-8')
         self.reports_dir = "reportes"
+        self._pending_writes = []
+
+        # Listado de reportes en memoria y totales del resumen
+        self._listing_cache = None
+        self._listing_dir_mtime = 0
+        self._summary_size = 0
+        self._summary_types = Counter()
+
         self.ensure_reports_directory()
 
     def ensure_reports_directory(self):
@@ -26,11 +241,55 @@ class ReportGenerator:
 
     def generate_timestamp(self) -> str:
         """Genera timestamp para nombres de archivo"""
-        return datetime.now().strftime("%Y%m%d_%H%M%S")
+        return _timestamps()[1]
 
     def generate_readable_timestamp(self) -> str:
         """Genera timestamp legible para contenido del reporte"""
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return _timestamps()[2]
+
+    def _write_report(self, filepath: str, *parts: bytes) -> Future:
+        """
+        Escribe un reporte a partir de sus partes ya codificadas (encabezado,
+        JSON y cierre) sin concatenarlas en memoria.
+        Con io_uring se envía una única escritura writev al sumidero compartido
+        sin esperar a que termine, así el llamador (p. ej. la interfaz de chat)
+        no se bloquea; flush() espera las escrituras pendientes y propaga sus errores
+        Args:
+            filepath: Ruta del archivo de reporte
+            parts: Partes del contenido en UTF-8
+        Returns:
+            Future que se resuelve con los bytes escritos
+        """
+        size = sum(map(len, parts))
+
+        sink = get_shared_sink()
+        if sink is not None:
+            fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DSYNC, 0o644)
+            future = sink.submit(UringOp('writev', fd, list(parts), close_fd=True))
+            future.add_done_callback(functools.partial(_report_write_done, filepath))
+            self._pending_writes = [f for f in self._pending_writes if not f.done()]
+            self._pending_writes.append(future)
+            self._add_to_listing(filepath, size)
+            return future
+
+        with open(filepath, 'wb') as f:
+            for part in parts:
+                f.write(part)
+        self._add_to_listing(filepath, size)
+        future = Future()
+        future.set_result(size)
+        return future
+
+    def flush(self):
+        """
+        Espera a que terminen todas las escrituras de reportes pendientes
+        Raises:
+            OSError: Si alguna de las escrituras falló
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        wait(pending)
+        for future in pending:
+            future.result()
 
     def create_chat_interaction_report(
         self,
@@ -55,50 +314,22 @@ class ReportGenerator:
         filename = f"chat_interaction_{timestamp}.md"
         filepath = os.path.join(self.reports_dir, filename)
 
-        content = f"""# Reporte de Interacción de Chat
-
-**Fecha y Hora:** {self.generate_readable_timestamp()}
-**Tipo de Reporte:** Interacción de Chat
-**ID de Reporte:** {timestamp}
-
-## Información de la Sesión
-
-- **Usuario:** {metadata.get('username', 'Anónimo') if metadata else 'Anónimo'}
-- **Sesión ID:** {metadata.get('session_id', 'N/A') if metadata else 'N/A'}
-- **Agente:** {metadata.get('agent_name', 'Agente de Pruebas') if metadata else 'Agente de Pruebas'}
-
-## Detalles de la Interacción
-
-### Mensaje del Usuario
-```
-{user_message}
-```
-
-### Respuesta del Agente
-```
-{agent_response}
-```
-
-## Métricas de Rendimiento
-
-- **Tiempo de Respuesta:** {response_time_ms}ms
-- **Tokens Utilizados:** {tokens_used if tokens_used else 'N/A'}
-- **Longitud del Mensaje:** {len(user_message)} caracteres
-- **Longitud de la Respuesta:** {len(agent_response)} caracteres
-
-## Metadatos Técnicos
-
-```json
-{json.dumps(metadata if metadata else {}, indent=2, ensure_ascii=False)}
-```
-
----
-*Reporte generado automáticamente por {self.app_config.get_app_name()}*
-"""
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-
+        m = metadata or {}
+        header = _CHAT_TPL.substitute(
+            readable_ts=self.generate_readable_timestamp(),
+            ts=timestamp,
+            user=m.get('username', 'Anónimo'),
+            session_id=m.get('session_id', 'N/A'),
+            agent=m.get('agent_name', 'Agente de Pruebas'),
+            user_message=user_message,
+            agent_response=agent_response,
+            rt=response_time_ms,
+            tokens=tokens_used if tokens_used else 'N/A',
+            um_len=len(user_message),
+            ar_len=len(agent_response)
+        )
+
+        self._write_report(filepath, header.encode('utf-8'), _dumps(m), self._trailer)
         return filepath
 
     def create_system_status_report(
@@ -116,55 +347,28 @@ class ReportGenerator:
         filename = f"system_status_{timestamp}.md"
         filepath = os.path.join(self.reports_dir, filename)
 
-        content = f"""# Reporte de Estado del Sistema
-
-**Fecha y Hora:** {self.generate_readable_timestamp()}
-**Tipo de Reporte:** Estado del Sistema
-**ID de Reporte:** {timestamp}
-
-## Información General
-
-- **Aplicación:** {self.app_config.get_app_name()}
-- **Entorno:** {self.app_config.get_environment()}
-- **Modo Debug:** {self.app_config.is_debug_mode()}
-- **Zona Horaria:** {self.app_config.get_timezone_name()}
-
-## Estado de Componentes
-
-### Base de Datos
-- **Estado:** {status_data.get('database_status', 'Desconocido')}
-- **Conexiones Activas:** {status_data.get('active_connections', 'N/A')}
-- **Última Verificación:** {status_data.get('last_db_check', 'N/A')}
-
-### Sistema de Archivos
-- **Carpeta Logs:** {'✅ Disponible' if os.path.exists('logs') else '❌ No disponible'}
-- **Carpeta Reportes:** {'✅ Disponible' if os.path.exists('reportes') else '❌ No disponible'}
-- **Espacio en Disco:** {status_data.get('disk_space', 'N/A')}
-
-### Memoria y Rendimiento
-- **Uso de Memoria:** {status_data.get('memory_usage', 'N/A')}
-- **Tiempo de Actividad:** {status_data.get('uptime', 'N/A')}
-- **Sesiones Activas:** {status_data.get('active_sessions', 0)}
-
-## Estadísticas de Uso
-
-- **Total de Usuarios:** {status_data.get('total_users', 0)}
-- **Interacciones Hoy:** {status_data.get('interactions_today', 0)}
-- **Reportes Generados:** {status_data.get('reports_generated', 0)}
-
-## Datos Técnicos
-
-```json
-{json.dumps(status_data, indent=2, ensure_ascii=False)}
-```
-
----
-*Reporte generado automáticamente por {self.app_config.get_app_name()}*
-"""
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-
+        header = _STATUS_TPL.substitute(
+            readable_ts=self.generate_readable_timestamp(),
+            ts=timestamp,
+            app=self._app_name,
+            env=self._env,
+            debug=self.app_config.is_debug_mode(),
+            tz=self.app_config.get_timezone_name(),
+            db_status=status_data.get('database_status', 'Desconocido'),
+            active_connections=status_data.get('active_connections', 'N/A'),
+            last_db_check=status_data.get('last_db_check', 'N/A'),
+            logs_dir='✅ Disponible' if os.path.exists('logs') else '❌ No disponible',
+            reports_dir='✅ Disponible' if os.path.exists('reportes') else '❌ No disponible',
+            disk_space=status_data.get('disk_space', 'N/A'),
+            memory_usage=status_data.get('memory_usage', 'N/A'),
+            uptime=status_data.get('uptime', 'N/A'),
+            active_sessions=status_data.get('active_sessions', 0),
+            total_users=status_data.get('total_users', 0),
+            interactions_today=status_data.get('interactions_today', 0),
+            reports_generated=status_data.get('reports_generated', 0)
+        )
+
+        self._write_report(filepath, header.encode('utf-8'), _dumps(status_data), self._trailer)
         return filepath
 
     def create_error_report(
@@ -188,46 +392,18 @@ class ReportGenerator:
         filename = f"error_report_{timestamp}.md"
         filepath = os.path.join(self.reports_dir, filename)
 
-        content = f"""# Reporte de Error
-
-**Fecha y Hora:** {self.generate_readable_timestamp()}
-**Tipo de Reporte:** Error del Sistema
-**ID de Reporte:** {timestamp}
-**Nivel de Severidad:** {'CRÍTICO' if 'critical' in error_type.lower() else 'ERROR'}
-
-## Información del Error
-
-- **Tipo de Error:** {error_type}
-- **Mensaje:** {error_message}
-- **Aplicación:** {self.app_config.get_app_name()}
-- **Entorno:** {self.app_config.get_environment()}
-
-## Stack Trace
-
-```
-{stack_trace if stack_trace else 'No disponible'}
-```
-
-## Contexto del Error
-
-```json
-{json.dumps(context if context else {}, indent=2, ensure_ascii=False)}
-```
-
-## Acciones Recomendadas
-
-1. Revisar los logs del sistema
-2. Verificar la configuración de la aplicación
-3. Comprobar la conectividad de la base de datos
-4. Revisar el uso de recursos del sistema
-
----
-*Reporte generado automáticamente por {self.app_config.get_app_name()}*
-"""
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-
+        header = _ERROR_TPL.substitute(
+            readable_ts=self.generate_readable_timestamp(),
+            ts=timestamp,
+            severity='CRÍTICO' if 'critical' in error_type.lower() else 'ERROR',
+            error_type=error_type,
+            error_message=error_message,
+            app=self._app_name,
+            env=self._env,
+            stack_trace=stack_trace if stack_trace else 'No disponible'
+        )
+
+        self._write_report(filepath, header.encode('utf-8'), _dumps(context if context else {}), self._error_trailer)
         return filepath
 
     def create_daily_summary_report(
@@ -242,91 +418,147 @@ class ReportGenerator:
             Path del archivo de reporte creado
         """
         timestamp = self.generate_timestamp()
-        date_str = datetime.now().strftime("%Y-%m-%d")
+        date_str = time.strftime("%Y-%m-%d")
         filename = f"daily_summary_{date_str}.md"
         filepath = os.path.join(self.reports_dir, filename)
 
-        content = f"""# Resumen Diario - {date_str}
-
-**Fecha y Hora de Generación:** {self.generate_readable_timestamp()}
-**Tipo de Reporte:** Resumen Diario
-**ID de Reporte:** {timestamp}
-
-## Estadísticas del Día
-
-### Actividad de Usuarios
-- **Usuarios Activos:** {summary_data.get('active_users', 0)}
-- **Nuevos Usuarios:** {summary_data.get('new_users', 0)}
-- **Sesiones Iniciadas:** {summary_data.get('sessions_started', 0)}
-- **Tiempo Promedio de Sesión:** {summary_data.get('avg_session_time', 'N/A')}
-
-### Interacciones de Chat
-- **Total de Mensajes:** {summary_data.get('total_messages', 0)}
-- **Mensajes de Usuario:** {summary_data.get('user_messages', 0)}
-- **Respuestas del Agente:** {summary_data.get('agent_responses', 0)}
-- **Tiempo Promedio de Respuesta:** {summary_data.get('avg_response_time', 'N/A')}
-
-### Sistema
-- **Reportes Generados:** {summary_data.get('reports_generated', 0)}
-- **Errores Registrados:** {summary_data.get('errors_logged', 0)}
-- **Tiempo de Actividad:** {summary_data.get('system_uptime', 'N/A')}
-
-## Tendencias
-
-- **Hora de Mayor Actividad:** {summary_data.get('peak_hour', 'N/A')}
-- **Agente Más Utilizado:** {summary_data.get('most_used_agent', 'N/A')}
-- **Tipo de Consulta Más Común:** {summary_data.get('common_query_type', 'N/A')}
-
-## Datos Completos
-
-```json
-{json.dumps(summary_data, indent=2, ensure_ascii=False)}
-```
-
----
-*Reporte generado automáticamente por {self.app_config.get_app_name()}*
-"""
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-
+        get = summary_data.get
+        header = _DAILY_TPL.substitute(
+            date=date_str,
+            readable_ts=self.generate_readable_timestamp(),
+            ts=timestamp,
+            active_users=get('active_users', 0),
+            new_users=get('new_users', 0),
+            sessions_started=get('sessions_started', 0),
+            avg_session_time=get('avg_session_time', 'N/A'),
+            total_messages=get('total_messages', 0),
+            user_messages=get('user_messages', 0),
+            agent_responses=get('agent_responses', 0),
+            avg_response_time=get('avg_response_time', 'N/A'),
+            reports_generated=get('reports_generated', 0),
+            errors_logged=get('errors_logged', 0),
+            system_uptime=get('system_uptime', 'N/A'),
+            peak_hour=get('peak_hour', 'N/A'),
+            most_used_agent=get('most_used_agent', 'N/A'),
+            common_query_type=get('common_query_type', 'N/A')
+        )
+
+        self._write_report(filepath, header.encode('utf-8'), _dumps(summary_data), self._trailer)
         return filepath
 
     def list_reports(self, limit: Optional[int] = None) -> List[Dict[str, str]]:
         """
-        Lista los reportes existentes
+        Lista los reportes existentes.
+        El listado se mantiene en memoria y solo se vuelve a leer del disco
+        cuando cambia la fecha de modificación de la carpeta
         Args:
             limit: Límite de reportes a listar
         Returns:
             Lista de diccionarios con información de reportes
         """
-        reports = []
+        try:
+            dir_mtime = os.stat(self.reports_dir).st_mtime
+        except OSError:
+            return []
+
+        if self._listing_cache is None or dir_mtime != self._listing_dir_mtime:
+            self._listing_cache = self._scan_reports()
+            self._listing_dir_mtime = dir_mtime
+            self._summary_size = sum(r['size'] for r in self._listing_cache)
+            self._summary_types = Counter()
+            for report in self._listing_cache:
+                self._count_report_type(report['filename'], 1)
 
-        if not os.path.exists(self.reports_dir):
-            return reports
+        if limit:
+            return self._listing_cache[:limit]
+        return list(self._listing_cache)
 
-        files = [f for f in os.listdir(self.reports_dir) if f.endswith('.md')]
-        files.sort(reverse=True)  # Más recientes primero
+    def _scan_reports(self) -> List[Dict[str, str]]:
+        """
+        Lee el listado completo de reportes desde el disco
+        Returns:
+            Lista de reportes ordenada de más reciente a más antiguo
+        """
+        reports = []
 
-        if limit:
-            files = files[:limit]
+        with os.scandir(self.reports_dir) as entries:
+            files = [entry for entry in entries if entry.name.endswith('.md')]
+        files.sort(key=lambda entry: entry.name, reverse=True)  # Más recientes primero
 
-        for filename in files:
-            filepath = os.path.join(self.reports_dir, filename)
+        for entry in files:
             try:
-                stat = os.stat(filepath)
+                stat = entry.stat()
                 reports.append({
-                    'filename': filename,
-                    'filepath': filepath,
+                    'filename': entry.name,
+                    'filepath': entry.path,
                     'size': stat.st_size,
-                    'created': datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m-%d %H:%M:%S'),
-                    'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
+                    'created': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stat.st_ctime)),
+                    'modified': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stat.st_mtime))
                 })
             except OSError:
                 continue
 
         return reports
 
+    def _add_to_listing(self, filepath: str, size: int):
+        """
+        Agrega un reporte recién escrito al listado en memoria
+        Args:
+            filepath: Ruta del reporte
+            size: Tamaño en bytes
+        """
+        if self._listing_cache is None:
+            return
+
+        filename = os.path.basename(filepath)
+        readable = self.generate_readable_timestamp()
+        report = {
+            'filename': filename,
+            'filepath': filepath,
+            'size': size,
+            'created': readable,
+            'modified': readable
+        }
+
+        # Un reporte sobrescrito (p. ej. el resumen diario) reemplaza su entrada
+        position = 0
+        for i, existing in enumerate(self._listing_cache):
+            if existing['filename'] == filename:
+                report['created'] = existing['created']
+                self._summary_size -= existing['size']
+                self._count_report_type(filename, -1)
+                del self._listing_cache[i]
+                break
+
+        for position, existing in enumerate(self._listing_cache):
+            if existing['filename'] < filename:
+                break
+        else:
+            position = len(self._listing_cache)
+
+        self._listing_cache.insert(position, report)
+        self._summary_size += size
+        self._count_report_type(filename, 1)
+
+        # La escritura propia no invalida el listado
+        try:
+            self._listing_dir_mtime = os.stat(self.reports_dir).st_mtime
+        except OSError:
+            self._listing_cache = None
+
+    def _count_report_type(self, filename: str, delta: int):
+        """Actualiza el conteo de reportes por tipo"""
+        for report_type in REPORT_PREFIXES:
+            if filename.startswith(report_type):
+                break
+        else:
+            # Archivo ajeno a los tipos conocidos
+            report_type = filename.split('_')[0]
+
+        self._summary_types[report_type] += delta
+        if self._summary_types[report_type] <= 0:
+            del self._summary_types[report_type]
+
     def get_reports_summary(self) -> Dict[str, Any]:
         """
         Obtiene un resumen de todos los reportes
@@ -335,18 +567,14 @@ class ReportGenerator:
         """
         reports = self.list_reports()
 
-        total_size = sum(r['size'] for r in reports)
-        report_types = {}
-
-        for report in reports:
-            report_type = report['filename'].split('_')[0]
-            report_types[report_type] = report_types.get(report_type, 0) + 1
+        # Totales mantenidos de forma incremental junto con el listado
+        total_size = self._summary_size
 
         return {
             'total_reports': len(reports),
             'total_size_bytes': total_size,
             'total_size_mb': round(total_size / (1024 * 1024), 2),
-            'report_types': report_types,
+            'report_types': dict(self._summary_types),
             'latest_report': reports[0] if reports else None,
             'oldest_report': reports[-1] if reports else None
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,507 @@
+# Sumidero de logs asíncrono basado en io_uring
+# Agrupa las escrituras de los archivos de log en lotes que se envían al kernel
+# con una sola llamada io_uring_submit, fuera del hilo que genera el log.
+# Los registros se copian a un buffer registrado en el anillo y los archivos
+# se referencian por índice, así el kernel no fija páginas ni resuelve el fd
+# en cada escritura. Con SQPOLL un hilo del kernel consume la cola de envío,
+# por lo que un flujo continuo de logs no requiere llamadas al sistema para enviar
+#
+# El mismo anillo atiende otras escrituras de la aplicación (p. ej. los reportes)
+# mediante UringOp, que se resuelven con un Future al recibir su CQE
+#
+# Requiere Linux y el paquete opcional liburing (pip install liburing).
+# Si no está disponible o el kernel no permite crear el anillo,
+# get_shared_sink() devuelve None y el Logger usa FastRotatingFileHandler
+
+import os
+import sys
+import atexit
+import mmap
+import queue
+import logging
+import platform
+import threading
+from typing import Optional
+from concurrent.futures import Future
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+URING_AVAILABLE = liburing is not None and platform.system() == 'Linux'
+
+
+class _LogFile:
+    """Estado de un archivo de log gestionado por el sumidero"""
+
+    __slots__ = ('path', 'fd', 'size', 'max_bytes', 'backup_count')
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.fd = -1
+        self.size = 0
+        self.open()
+
+    def open(self):
+        """Abre (o crea) el archivo y toma su tamaño actual como offset de escritura"""
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_CREAT, 0o644)
+        self.size = os.fstat(self.fd).st_size
+
+    def close(self):
+        """Cierra el descriptor del archivo"""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def should_rotate(self, length: int) -> bool:
+        """Indica si escribir length bytes superaría el tamaño máximo"""
+        return self.max_bytes > 0 and self.size > 0 and self.size + length > self.max_bytes
+
+    def rotate(self):
+        """Rota los respaldos (.1, .2, ...) igual que RotatingFileHandler"""
+        self.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{i}"
+                target = f"{self.path}.{i + 1}"
+                if os.path.exists(source):
+                    if os.path.exists(target):
+                        os.remove(target)
+                    os.rename(source, target)
+            target = f"{self.path}.1"
+            if os.path.exists(target):
+                os.remove(target)
+            os.rename(self.path, target)
+        self.open()
+
+
+class UringOp:
+    """
+    Operación de E/S enviada al sumidero fuera del flujo de logs.
+    Su Future se resuelve con el resultado del CQE
+    """
+
+    __slots__ = ('opcode', 'fd', 'buf', 'length', 'close_fd', 'future', '_iov')
+
+    OPCODES = ('write', 'writev', 'unlinkat')
+
+    def __init__(self, opcode: str, fd: int, buf, length: int = None, close_fd: bool = False):
+        """
+        Args:
+            opcode: 'write', 'writev' (buf es una lista de bytes) o 'unlinkat'
+            fd: Descriptor del archivo (o del directorio para unlinkat)
+            buf: Datos a escribir o nombre del archivo a eliminar
+            length: Bytes a escribir (por defecto todo buf)
+            close_fd: Cerrar fd al completarse la operación
+        """
+        if opcode not in self.OPCODES:
+            raise ValueError(f"Operación io_uring no soportada: {opcode}")
+        self.opcode = opcode
+        self.fd = fd
+        self.buf = buf
+        if length is None:
+            length = sum(map(len, buf)) if opcode == 'writev' else len(buf)
+        self.length = length
+        self.close_fd = close_fd
+        self.future = Future()
+        self._iov = None
+
+    def prepare(self, sqe):
+        """Prepara el SQE correspondiente a la operación"""
+        if self.opcode == 'write':
+            liburing.io_uring_prep_write(sqe, self.fd, self.buf, self.length, 0)
+        elif self.opcode == 'writev':
+            # Escritura gather: cada parte se escribe desde su propio buffer
+            self._iov = liburing.iovec(self.buf)
+            liburing.io_uring_prep_writev(sqe, self.fd, self._iov, len(self.buf), 0)
+        elif self.opcode == 'unlinkat':
+            # fd es el directorio y buf el nombre del archivo a eliminar
+            liburing.io_uring_prep_unlinkat(sqe, self.fd, self.buf, 0)
+
+    def run_sync(self):
+        """Ejecuta la operación con llamadas normales cuando el anillo no está disponible"""
+        try:
+            if self.opcode == 'write':
+                result = os.pwrite(self.fd, memoryview(self.buf)[:self.length], 0)
+            elif self.opcode == 'writev':
+                result = os.pwritev(self.fd, self.buf, 0)
+            else:
+                os.unlink(self.buf, dir_fd=self.fd)
+                result = 0
+        except OSError as error:
+            result = -error.errno
+        self.finish(result)
+
+    def finish(self, result: int):
+        """Completa la operación con el resultado del CQE y resuelve el Future"""
+        try:
+            if result < 0:
+                raise OSError(-result, os.strerror(-result))
+            if self.opcode in ('write', 'writev') and result < self.length:
+                # Escritura parcial: se completa de forma síncrona
+                data = b''.join(self.buf) if self.opcode == 'writev' else self.buf
+                os.pwrite(self.fd, memoryview(data)[result:self.length], result)
+                result = self.length
+        except OSError as error:
+            self.future.set_exception(error)
+        else:
+            self.future.set_result(result)
+        finally:
+            self._iov = None
+            if self.close_fd:
+                os.close(self.fd)
+
+
+class UringLogSink:
+    """
+    Sumidero de logs que escribe en lotes mediante io_uring.
+    Un hilo daemon drena una cola de registros ya formateados, prepara un SQE
+    de escritura por registro y envía todo el lote con un único io_uring_submit
+    """
+
+    ARENA_SIZE = 4 * 1024 * 1024
+
+    SQ_THREAD_IDLE_MS = 2000
+
+    def __init__(self, entries: int = 256, max_batch: int = 64, sq_thread_cpu: int = None):
+        self.max_batch = min(max_batch, entries)
+        self._files = []
+        self._files_registered = False
+        self._closed = False
+        self._queue = queue.Queue()
+        self._entries = entries
+        self._sq_thread_cpu = sq_thread_cpu
+
+        self._cqe = liburing.io_uring_cqe()
+        self._init_ring(entries, sq_thread_cpu)
+
+        # Buffer de staging alineado a página, registrado una sola vez
+        self._arena = mmap.mmap(-1, self.ARENA_SIZE)
+        self._view = memoryview(self._arena)
+        try:
+            liburing.io_uring_register_buffers(self._ring, liburing.iovec(self._arena), 1)
+        except OSError:
+            self._view.release()
+            self._arena.close()
+            liburing.io_uring_queue_exit(self._ring)
+            raise
+
+        self._thread = threading.Thread(target=self._run, name='uring-log-sink', daemon=True)
+        self._thread.start()
+
+    def _init_ring(self, entries: int, sq_thread_cpu: int = None):
+        """
+        Inicializa el anillo con SQPOLL; si el kernel no lo permite
+        (p. ej. sin privilegios en kernels anteriores a 5.11) usa el modo normal
+        Args:
+            entries: Tamaño de la cola de envío
+            sq_thread_cpu: CPU a la que fijar el hilo de sondeo (por defecto sin fijar)
+        Raises:
+            OSError: Si el kernel no permite crear el anillo (io_uring deshabilitado,
+                     seccomp en contenedores, etc.)
+        """
+        self._ring = liburing.io_uring()
+
+        params = liburing.io_uring_params()
+        params.flags = liburing.IORING_SETUP_SQPOLL
+        params.sq_thread_idle = self.SQ_THREAD_IDLE_MS
+        if sq_thread_cpu is not None:
+            # Solo se fija si se pide: el planificador reparte el hilo entre las CPU
+            params.flags |= liburing.IORING_SETUP_SQ_AFF
+            params.sq_thread_cpu = sq_thread_cpu
+        try:
+            liburing.io_uring_queue_init_params(entries, self._ring, params)
+        except OSError as error:
+            print(f"Error al activar SQPOLL en el log, usando modo normal: {error}", file=sys.stderr)
+            # Anillo nuevo: el intento fallido no debe dejar estado a medias
+            self._ring = liburing.io_uring()
+            liburing.io_uring_queue_init(entries, self._ring, 0)
+
+    def add_file(self, path: str, max_bytes: int = 0, backup_count: int = 0) -> int:
+        """
+        Registra un archivo de log en el sumidero
+        Args:
+            path: Ruta del archivo
+            max_bytes: Tamaño a partir del cual se rota (0 = sin rotación)
+            backup_count: Número de respaldos a conservar
+        Returns:
+            Índice del archivo para usar en write()
+        """
+        self._files.append(_LogFile(path, max_bytes, backup_count))
+        # La tabla de archivos se registra de nuevo en el próximo lote
+        self._files_registered = False
+        return len(self._files) - 1
+
+    def write(self, index: int, data: bytes):
+        """
+        Encola un registro formateado para escribirlo en el archivo indicado
+        Args:
+            index: Índice devuelto por add_file()
+            data: Bytes del registro (incluido el salto de línea)
+        """
+        self._queue.put((index, data))
+
+    def submit(self, op: UringOp) -> Future:
+        """
+        Encola una operación para enviarla en el próximo lote
+        Args:
+            op: Operación a ejecutar
+        Returns:
+            Future que se resuelve al completarse la operación
+        """
+        self._queue.put(op)
+        return op.future
+
+    def close(self):
+        """Escribe los registros pendientes, detiene el hilo y libera el anillo"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        if self._ring is not None:
+            self._unregister_files()
+            liburing.io_uring_unregister_buffers(self._ring)
+            liburing.io_uring_queue_exit(self._ring)
+        self._view.release()
+        self._arena.close()
+        for log_file in self._files:
+            log_file.close()
+
+    def _register_files(self):
+        """Registra los descriptores de los archivos de log en el anillo"""
+        if not self._files_registered:
+            self._unregister_files()
+            fds = [log_file.fd for log_file in self._files]
+            liburing.io_uring_register_files(self._ring, fds, len(fds))
+            self._files_registered = True
+
+    def _unregister_files(self):
+        """Libera la tabla de archivos registrados (necesario antes de rotar)"""
+        if self._files_registered:
+            liburing.io_uring_unregister_files(self._ring)
+            self._files_registered = False
+
+    def _run(self):
+        """Bucle del hilo: agrupa hasta max_batch registros por envío"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            # Un lote fallido no debe detener el hilo: los registros siguientes
+            # se siguen escribiendo y quien espera una operación recibe el error
+            try:
+                if self._ring is None:
+                    self._submit_sync(batch)
+                else:
+                    self._submit(batch)
+            except Exception as error:
+                print(f"Error al escribir lote de logs: {error}", file=sys.stderr)
+                self._fail_batch(batch, error)
+
+            if stop:
+                return
+
+    def _fail_batch(self, batch: list, error: Exception):
+        """
+        Recrea el anillo y resuelve con error las operaciones del lote que no
+        llegaron a completarse
+        Args:
+            batch: Lote que falló
+            error: Excepción a entregar a los Future pendientes
+        """
+        # Antes de cerrar descriptores: no debe quedar ninguna escritura en vuelo
+        self._reset_ring()
+        for item in batch:
+            if not isinstance(item, UringOp) or item.future.done():
+                continue
+            item._iov = None
+            if item.close_fd:
+                try:
+                    os.close(item.fd)
+                except OSError:
+                    pass
+            item.future.set_exception(error)
+
+    def _reset_ring(self):
+        """
+        Recrea el anillo tras un lote fallido para que los SQE que quedaron
+        preparados o en vuelo no se mezclen con los CQE del lote siguiente.
+        io_uring_queue_exit espera a las operaciones en curso, así que después
+        el buffer registrado puede reutilizarse. Si el anillo no puede recrearse,
+        los lotes siguientes se escriben con llamadas normales
+        """
+        if self._ring is None:
+            return
+        self._files_registered = False
+        try:
+            liburing.io_uring_queue_exit(self._ring)
+            # Los registros del lote que no llegaron a escribirse no deben dejar huecos
+            for log_file in self._files:
+                log_file.size = os.fstat(log_file.fd).st_size
+            self._init_ring(self._entries, self._sq_thread_cpu)
+            liburing.io_uring_register_buffers(self._ring, liburing.iovec(self._arena), 1)
+        except Exception as error:
+            print(f"Error al reiniciar io_uring del log, usando E/S normal: {error}", file=sys.stderr)
+            self._ring = None
+
+    def _submit_sync(self, batch: list):
+        """Escribe un lote sin io_uring (el anillo no pudo recrearse)"""
+        for item in batch:
+            if isinstance(item, UringOp):
+                item.run_sync()
+                continue
+
+            index, data = item
+            log_file = self._files[index]
+            if log_file.should_rotate(len(data)):
+                try:
+                    log_file.rotate()
+                except OSError as error:
+                    print(f"Error al rotar log {log_file.path}: {error}", file=sys.stderr)
+            os.pwrite(log_file.fd, data, log_file.size)
+            log_file.size += len(data)
+
+    def _submit(self, batch: list):
+        """Copia los registros al buffer registrado y los envía con una sola llamada al kernel"""
+        self._register_files()
+        # pending[i] es None para escrituras de log o la UringOp con user_data i
+        pending = []
+        offset = 0
+        for item in batch:
+            if isinstance(item, UringOp):
+                sqe = liburing.io_uring_get_sqe(self._ring)
+                item.prepare(sqe)
+                liburing.io_uring_sqe_set_data64(sqe, len(pending))
+                pending.append(item)
+                continue
+
+            index, data = item
+            log_file = self._files[index]
+            length = len(data)
+
+            if log_file.should_rotate(length):
+                # Las escrituras ya preparadas deben completarse antes de renombrar
+                self._complete(pending)
+                pending = []
+                offset = 0
+                self._rotate(log_file)
+
+            if length > self.ARENA_SIZE:
+                # Registro excepcional que no cabe en el buffer: escritura normal
+                os.pwrite(log_file.fd, data, log_file.size)
+                log_file.size += length
+                continue
+
+            if offset + length > self.ARENA_SIZE:
+                self._complete(pending)
+                pending = []
+                offset = 0
+
+            # El buffer se reutiliza desde el inicio en cada lote (bump pointer)
+            buffer = self._view[offset:offset + length]
+            buffer[:] = data
+
+            # Offsets explícitos: el orden de ejecución dentro del lote no importa
+            sqe = liburing.io_uring_get_sqe(self._ring)
+            liburing.io_uring_prep_write_fixed(sqe, index, buffer, length, log_file.size, 0)
+            liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_FIXED_FILE)
+            liburing.io_uring_sqe_set_data64(sqe, len(pending))
+            log_file.size += length
+            offset += length
+            pending.append(None)
+
+        self._complete(pending)
+
+    def _rotate(self, log_file: _LogFile):
+        """Rota un archivo reabriendo y registrando de nuevo la tabla de descriptores"""
+        self._unregister_files()
+        try:
+            log_file.rotate()
+        except OSError as error:
+            print(f"Error al rotar log {log_file.path}: {error}", file=sys.stderr)
+        self._register_files()
+
+    def _complete(self, pending: list):
+        """Envía los SQE preparados y espera sus CQE"""
+        if not pending:
+            return
+
+        # Con SQPOLL, io_uring_submit solo publica la cola y entra al kernel
+        # únicamente si el hilo de sondeo está dormido (io_uring_sq_need_wakeup)
+        liburing.io_uring_submit(self._ring)
+        liburing.io_uring_wait_cqe_nr(self._ring, self._cqe, len(pending))
+        for _ in pending:
+            liburing.io_uring_peek_cqe(self._ring, self._cqe)
+            result = self._cqe.res
+            op = pending[liburing.io_uring_cqe_get_data64(self._cqe)]
+            liburing.io_uring_cqe_seen(self._ring, self._cqe)
+            if op is not None:
+                op.finish(result)
+            elif result < 0:
+                print(f"Error al escribir log: {os.strerror(-result)}", file=sys.stderr)
+
+
+_shared_sink = None
+_shared_sink_lock = threading.Lock()
+
+
+_shared_sink_failed = not URING_AVAILABLE
+
+
+def get_shared_sink() -> Optional[UringLogSink]:
+    """
+    Obtiene el sumidero compartido por el logger y el resto de la aplicación.
+    Se crea en el primer uso y se cierra al terminar el proceso
+    Returns:
+        Instancia única de UringLogSink, o None si io_uring no está disponible
+        o no se pudo inicializar (los llamadores usan E/S normal)
+    """
+    global _shared_sink, _shared_sink_failed
+    if _shared_sink is None and not _shared_sink_failed:
+        with _shared_sink_lock:
+            if _shared_sink is None and not _shared_sink_failed:
+                try:
+                    _shared_sink = UringLogSink()
+                except (OSError, AttributeError) as error:
+                    # AttributeError: versión de liburing sin alguna función usada
+                    print(f"Error al inicializar io_uring, usando E/S normal: {error}", file=sys.stderr)
+                    _shared_sink_failed = True
+                    return None
+                atexit.register(_shared_sink.close)
+    return _shared_sink
+
+
+class UringFileHandler(logging.Handler):
+    """
+    Handler de logging que formatea el registro y lo entrega al sumidero io_uring.
+    Se usa detrás de un QueueListener, por lo que nunca bloquea al hilo que registra
+    """
+
+    def __init__(self, sink: UringLogSink, filename: str, max_bytes: int = 0, backup_count: int = 0):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self._sink = sink
+        self._index = sink.add_file(self.baseFilename, max_bytes, backup_count)
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self._sink.write(self._index, (self.format(record) + '\n').encode('utf-8'))
+        except Exception:
+            self.handleError(record)
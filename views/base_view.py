@@ -2,9 +2,12 @@
 # Contiene métodos comunes para el formateo y presentación de datos
 # Maneja la renderización de respuestas y mensajes al usuario
 
-import json
-from datetime import datetime
-from config.app_config import AppConfig
+import time
+import orjson
+from config.app_config_cache import get_app_config
+
+# Opciones de serialización: indentado, claves no string y arrays de numpy
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
 
 
 class BaseView:
@@ -15,8 +18,9 @@ class BaseView:
 
     def __init__(self):
         # Inicializa la configuración de la aplicación
-        self.app_config = AppConfig()
+        self.app_config = get_app_config()
         self.timezone = self.app_config.get_timezone()
+        self._ts_fn = time.strftime
 
     def format_response(self, data, status="success", message=""):
         """
@@ -57,7 +61,7 @@ class BaseView:
         Returns:
             String con la fecha y hora actual
         """
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self._ts_fn("%Y-%m-%d %H:%M:%S")
 
     def render_json(self, data):
         """
@@ -67,4 +71,15 @@ class BaseView:
         Returns:
             String JSON formateado
         """
-        return json.dumps(data, ensure_ascii=False, indent=2)
\ No newline at end of file
+        return orjson.dumps(data, option=_JSON_OPTIONS).decode('utf-8')
+
+    def render_json_bytes(self, data):
+        """
+        Convierte los datos a JSON codificado en UTF-8, listo para escribir
+        en un socket o archivo sin volver a codificar
+        Args:
+            data: Datos a convertir
+        Returns:
+            Bytes JSON formateados
+        """
+        return orjson.dumps(data, option=_JSON_OPTIONS)
\ No newline at end of file